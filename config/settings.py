@@ -11,10 +11,47 @@ GOAL = 3
 ATTRACTIVE_GAIN = 1.0     # strength of goal attraction
 REPULSIVE_GAIN = 50.0     # strength of obstacle repulsion
 OBSTACLE_INFLUENCE = 3    # how many grid cells around an obstacle repel the robot
+POTENTIAL_TILE_SIZE = 512 # tile edge (cells) for the out-of-core potential field
 
 # Robot settings
 ROBOT_WIDTH = 2           # in grid cells (simple inflation model)
 ROBOT_HEIGHT = 2
 
+# Hierarchical planner (HPA*) settings
+HPA_CLUSTER_SIZE = 10     # cluster edge in grid cells
+HPA_CACHE_SIZE = 8        # number of cluster abstractions kept in memory
+
+# Anytime planner (ARA*) settings
+ANYTIME_DEADLINE_MS = 50       # default wall-clock budget for method="anytime"
+ANYTIME_INITIAL_WEIGHT = 3.0   # heuristic inflation of the first solution
+ANYTIME_WEIGHT_STEP = 0.5      # weight decrease between improvements
+
+# Field cache settings
+FIELD_CACHE_MAX_BYTES = 256 * 1024 * 1024   # in-memory budget for cached grids/fields
+FIELD_CACHE_DIR = None                      # directory for the on-disk cache (None = memory only)
+
+# Planning service settings
+SERVICE_SOCKET = "/tmp/micro-navigator.sock"  # Unix socket of run_server.py
+SERVICE_HOST = "127.0.0.1"                    # TCP address (run_server.py --tcp)
+SERVICE_PORT = 8765
+SERVICE_WORKERS = 4                           # planning threads
+SERVICE_MAP_DIR = "map"                       # only map files inside this directory are served
+SERVICE_MAX_MAPS = 16                         # maps kept loaded (least recently used are dropped)
+SERVICE_MAX_BATCH = 1000                      # plan requests allowed in one batch
+
+# Evaluation settings
+EVALUATION_WORKERS = 1    # worker processes for run_evaluation.py (1 = sequential)
+
+# Distance matrix settings
+DISTANCE_MATRIX_WORKERS = 4   # worker processes of a SearchPool (the planning server keeps one)
+DISTANCE_MATRIX_PARALLEL_CELLS = 2_000_000   # smaller jobs (map cells x searches) run in-process
+
+# Path export settings
+COMPRESS_PATH = True      # export line-of-sight waypoints instead of every cell
+EXPORT_FORMAT = "csv"     # "csv", "delta" (row/col changes) or "binary" (varints)
+
 # Visualization settings
-SHOW_POTENTIAL = True
\ No newline at end of file
+SHOW_POTENTIAL = True          # draw the potential field as a heatmap behind the path
+RENDER_MAX_PIXELS = 4_000_000  # larger maps are downsampled to fit this many pixels
+RENDER_MIN_SIZE = 400          # smaller maps are enlarged to this many pixels (longer side)
+RENDER_WORKERS = 2             # background rendering threads in the evaluator
@@ -0,0 +1,248 @@
+import os
+import io
+import json
+import math
+import time
+import statistics as stats_lib
+from contextlib import redirect_stdout
+
+from map.map_generator import generate_map, MAP_FAMILIES, MAX_ROBOT_SIZE
+from planner.potential_field import compute_potential_field
+from planner.path_extractor import extract_path
+from robot.shape_handler import inflate_obstacles
+
+DEFAULT_SIZES = (50, 100, 200, 500, 1000, 2000)
+DEFAULT_ROBOT_SIZES = tuple(range(1, MAX_ROBOT_SIZE + 1))
+STAGES = ("generate", "inflate", "potential", "search")
+
+# One-sided 95% critical values of Student's t for 1..30 degrees of freedom
+# (the test only asks whether the current run is slower)
+_T_CRITICAL_95 = (
+    6.314, 2.920, 2.353, 2.132, 2.015, 1.943, 1.895, 1.860, 1.833, 1.812,
+    1.796, 1.782, 1.771, 1.761, 1.753, 1.746, 1.740, 1.734, 1.729, 1.725,
+    1.721, 1.717, 1.714, 1.711, 1.708, 1.706, 1.703, 1.701, 1.699, 1.697,
+)
+
+
+def build_cases(families=None, sizes=None, robot_sizes=None, seed=0):
+    """
+    Builds the benchmark case list (every family x size x robot size).
+
+    Returns:
+        list of dicts with keys: 'name', 'family', 'size', 'robot_size', 'seed'
+    """
+    families = families or MAP_FAMILIES
+    sizes = sizes or DEFAULT_SIZES
+    robot_sizes = robot_sizes or DEFAULT_ROBOT_SIZES
+
+    cases = []
+    for family in families:
+        for size in sizes:
+            for robot_size in robot_sizes:
+                cases.append({
+                    "name": f"{family}-{size}x{size}-robot{robot_size}x{robot_size}",
+                    "family": family,
+                    "size": size,
+                    "robot_size": robot_size,
+                    "seed": seed,
+                })
+    return cases
+
+
+class BenchmarkRunner:
+    """
+    Times every pipeline stage on generated maps and compares runs.
+    """
+
+    def __init__(self, repeats=3, method="astar", backend="numpy"):
+        """
+        Args:
+            repeats: runs per case
+            method: search method passed to extract_path
+            backend: potential field backend ("numpy", "python" or "lazy")
+        """
+        self.repeats = repeats
+        self.method = method
+        self.backend = backend
+        self.results = []
+
+    def run_case(self, case):
+        """
+        Runs one benchmark case `repeats` times.
+
+        Returns:
+            dict with per-stage mean times, raw samples and path info
+        """
+        print(f"Benchmarking {case['name']}...", flush=True)
+
+        samples = {stage: [] for stage in STAGES}
+        samples["planning"] = []
+        path = []
+        goal = None
+
+        for _ in range(self.repeats):
+            t0 = time.perf_counter()
+            grid, start, goal = generate_map(case["family"], case["size"], seed=case["seed"])
+            t1 = time.perf_counter()
+            inflated = inflate_obstacles(grid, case["robot_size"], case["robot_size"])
+            t2 = time.perf_counter()
+            potential = compute_potential_field(inflated, goal, backend=self.backend)
+            t3 = time.perf_counter()
+            path = _quiet(extract_path, potential, start, goal, method=self.method)
+            t4 = time.perf_counter()
+
+            samples["generate"].append((t1 - t0) * 1000)
+            samples["inflate"].append((t2 - t1) * 1000)
+            samples["potential"].append((t3 - t2) * 1000)
+            samples["search"].append((t4 - t3) * 1000)
+            samples["planning"].append((t4 - t2) * 1000)
+
+        result = {
+            "scenario_name": case["name"],
+            "family": case["family"],
+            "size": case["size"],
+            "robot_size": case["robot_size"],
+            "seed": case["seed"],
+            "method": self.method,
+            "backend": self.backend,
+            "success": bool(path) and path[-1] == goal,
+            "path_length": len(path),
+            "planning_time_ms": stats_lib.mean(samples["planning"]),
+            "stages_ms": {stage: stats_lib.mean(samples[stage]) for stage in STAGES},
+            "samples_ms": samples,
+        }
+        self.results.append(result)
+        return result
+
+    def run(self, cases):
+        """Runs all cases in order."""
+        self.results = []
+        for case in cases:
+            self.run_case(case)
+
+    def save_results(self, output_file="evaluation/benchmark_results.json"):
+        """Saves results as JSON."""
+        os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+        with open(output_file, "w") as f:
+            json.dump(self.results, f, indent=2)
+        print(f"\nBenchmark results saved to: {output_file}")
+
+    def print_table(self):
+        """Prints per-stage timings for all cases."""
+        if not self.results:
+            print("No results to display.")
+            return
+
+        print("\n" + "=" * 110)
+        print("BENCHMARK RESULTS (mean ms)")
+        print("=" * 110)
+        header = f"{'Case':<36} {'Status':<8} " + " ".join(f"{s:>12}" for s in STAGES) + f" {'Path Len':>10}"
+        print(header)
+        print("-" * 110)
+        for r in self.results:
+            status = "OK" if r["success"] else "FAILED"
+            times = " ".join(f"{r['stages_ms'][s]:>12.2f}" for s in STAGES)
+            print(f"{r['scenario_name']:<36} {status:<8} {times} {r['path_length']:>10}")
+        print("=" * 110)
+
+    def compare_to_baseline(self, baseline_file, min_slowdown=0.05):
+        """
+        Compares this run with a stored baseline.
+
+        The baseline is the JSON written by save_results for an earlier
+        run; cases are matched by name (family, map size and robot size), so
+        only cases present in both runs are compared. The evaluator's
+        results.json describes different maps and is rejected. A metric is
+        flagged when it is at least min_slowdown slower and the difference
+        is significant at the one-sided 95% level (Welch's t-test).
+
+        Returns:
+            list of dicts describing each compared metric
+        """
+        with open(baseline_file) as f:
+            entries = json.load(f)
+
+        if any("samples_ms" not in r for r in entries):
+            raise ValueError(
+                f"{baseline_file} is not a benchmark results file "
+                f"(expected the output of run_benchmark.py)."
+            )
+        baseline = {r["scenario_name"]: r for r in entries}
+
+        comparisons = []
+        for result in self.results:
+            base = baseline.get(result["scenario_name"])
+            if base is None:
+                continue
+
+            for metric, current in result["samples_ms"].items():
+                previous = base["samples_ms"].get(metric)
+                if not previous:
+                    continue
+
+                cur_mean = stats_lib.mean(current)
+                base_mean = stats_lib.mean(previous)
+                change = (cur_mean / base_mean - 1.0) if base_mean > 0 else 0.0
+
+                comparisons.append({
+                    "scenario_name": result["scenario_name"],
+                    "metric": metric,
+                    "baseline_ms": base_mean,
+                    "current_ms": cur_mean,
+                    "change": change,
+                    "regression": change >= min_slowdown and _significant(current, previous),
+                })
+
+        return comparisons
+
+
+def print_comparison(comparisons):
+    """Prints baseline comparisons, regressions first."""
+    if not comparisons:
+        print("No matching baseline entries.")
+        return
+
+    print("\n" + "=" * 100)
+    print("BASELINE COMPARISON")
+    print("=" * 100)
+    print(f"{'Case':<36} {'Metric':<10} {'Baseline':>12} {'Current':>12} {'Change':>9}  Flag")
+    print("-" * 100)
+    for c in sorted(comparisons, key=lambda c: (not c["regression"], -c["change"])):
+        flag = "SLOWER" if c["regression"] else ""
+        print(f"{c['scenario_name']:<36} {c['metric']:<10} {c['baseline_ms']:>12.2f} "
+              f"{c['current_ms']:>12.2f} {c['change'] * 100:>8.1f}%  {flag}")
+    print("=" * 100)
+
+    regressions = sum(1 for c in comparisons if c["regression"])
+    print(f"Significant slowdowns: {regressions} of {len(comparisons)} metrics")
+
+
+def _significant(current, previous):
+    """True if mean(current) > mean(previous) at the one-sided 95% level."""
+    n1, n2 = len(current), len(previous)
+    m1, m2 = stats_lib.mean(current), stats_lib.mean(previous)
+    v1 = stats_lib.variance(current) if n1 > 1 else 0.0
+    v2 = stats_lib.variance(previous) if n2 > 1 else 0.0
+
+    if n1 < 2 and n2 < 2:
+        return False
+
+    se2 = v1 / n1 + v2 / n2
+    if se2 == 0:
+        return m1 > m2
+
+    t = (m1 - m2) / math.sqrt(se2)
+
+    # Welch-Satterthwaite degrees of freedom
+    terms = [(v / n) ** 2 / (n - 1) for v, n in ((v1, n1), (v2, n2)) if n > 1]
+    df = se2 ** 2 / sum(terms) if sum(terms) > 0 else 1
+    df = max(1, int(df))
+
+    critical = _T_CRITICAL_95[df - 1] if df <= len(_T_CRITICAL_95) else 1.645
+    return t > critical
+
+
+def _quiet(func, *args, **kwargs):
+    """Runs func with its console output suppressed."""
+    with redirect_stdout(io.StringIO()):
+        return func(*args, **kwargs)
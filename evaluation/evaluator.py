@@ -1,13 +1,21 @@
 import os
+import io
 import json
 import csv
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, util
+
+import numpy as np
+
 from map.grid_loader import load_grid
-from planner.potential_field import compute_potential_field
+from map.occupancy_grid import OccupancyGrid
 from planner.path_extractor import extract_path
 from planner.statistics import PlanningStatistics
-from robot.shape_handler import inflate_obstacles
+from planner.field_cache import FieldCache
 from visualization.draw_path import draw_path
-from config.settings import ROBOT_WIDTH, ROBOT_HEIGHT
+from visualization.renderer import RenderQueue
+from config.settings import ROBOT_WIDTH, ROBOT_HEIGHT, SHOW_POTENTIAL
 
 
 class PerformanceEvaluator:
@@ -15,10 +23,21 @@ class PerformanceEvaluator:
     Evaluates the planner's performance across multiple scenarios.
     """
 
-    def __init__(self):
+    def __init__(self, cache=None, track_memory=False, background_render=True):
+        """
+        Args:
+            cache: FieldCache shared by all scenarios (default: a new in-memory cache)
+            track_memory: record peak memory per pipeline stage (slower)
+            background_render: write the path images on background threads
+                               (call wait_for_renders() before using them)
+        """
         self.results = []
+        self.cache = cache if cache is not None else FieldCache()
+        self.track_memory = track_memory
+        self.render_queue = RenderQueue() if background_render else None
 
-    def run_scenario(self, map_file, scenario_name, robot_width=None, robot_height=None):
+    def run_scenario(self, map_file, scenario_name, robot_width=None, robot_height=None,
+                     map_data=None, method="astar", use_potential=False):
         """
         Runs planning on a single scenario and collects statistics.
 
@@ -27,6 +46,9 @@ class PerformanceEvaluator:
             scenario_name: descriptive name for this scenario
             robot_width: override robot width (optional)
             robot_height: override robot height (optional)
+            map_data: already loaded (grid, start, goal) for map_file (optional)
+            method: search method passed to extract_path (default "astar")
+            use_potential: passed to extract_path (potential-guided "jps")
 
         Returns:
             PlanningStatistics object with results
@@ -40,26 +62,47 @@ class PerformanceEvaluator:
         print(f"Running Scenario: {scenario_name}")
         print(f"Map File: {map_file}")
         print(f"Robot Size: {robot_height} x {robot_width}")
+        print(f"Search Method: {method}")
         print(f"{'='*60}")
 
-        stats = PlanningStatistics()
+        stats = PlanningStatistics(track_memory=self.track_memory)
 
         try:
             # Load the map
-            grid, start, goal = load_grid(map_file)
-            stats.set_map_info(grid, robot_width, robot_height)
+            with stats.stage("load"):
+                if map_data is None:
+                    map_data = load_grid(map_file)
+                grid, start, goal = map_data
+                stats.set_map_info(grid, robot_width, robot_height)
 
             # Inflate obstacles for robot shape
-            inflated_grid = inflate_obstacles(grid, robot_width, robot_height)
+            with stats.stage("inflate"):
+                self.cache.get_inflated_grid(grid, robot_width, robot_height, statistics=stats)
+                reachability = self.cache.get_reachability(
+                    grid, robot_width, robot_height, statistics=stats
+                )
+                abstraction = None
+                if method == "hpa":
+                    abstraction = self.cache.get_abstraction(
+                        grid, robot_width, robot_height, statistics=stats
+                    )
 
             # Start timing
             stats.start_timer()
 
             # Compute potential field
-            potential = compute_potential_field(inflated_grid, goal)
+            with stats.stage("potential"):
+                potential = self.cache.get_potential_field(
+                    grid, goal, robot_width, robot_height, statistics=stats
+                )
 
             # Extract path
-            path = extract_path(potential, start, goal, statistics=stats)
+            with stats.stage("search"):
+                path = extract_path(
+                    potential, start, goal, statistics=stats, method=method,
+                    reachability=reachability, abstraction=abstraction,
+                    use_potential=use_potential,
+                )
 
             # Stop timing
             stats.stop_timer()
@@ -72,8 +115,16 @@ class PerformanceEvaluator:
                 # Save visualization
                 output_file = f"evaluation/{scenario_name}_path.png"
                 os.makedirs("evaluation", exist_ok=True)
-                draw_path(grid, path, output_file)
-                print(f"Visualization saved: {output_file}")
+                background = potential if SHOW_POTENTIAL else None
+                with stats.stage("render"):
+                    if self.render_queue is not None:
+                        self.render_queue.submit(draw_path, grid, path, output_file, background)
+                    else:
+                        draw_path(grid, path, output_file, background)
+                if self.render_queue is not None:
+                    print(f"Visualization queued: {output_file}")
+                else:
+                    print(f"Visualization saved: {output_file}")
 
             else:
                 stats.set_success(False, "Path did not reach goal")
@@ -90,29 +141,95 @@ class PerformanceEvaluator:
         result = {
             "scenario_name": scenario_name,
             "map_file": map_file,
+            "method": method,
+            "use_potential": use_potential,
             **stats.get_dict()
         }
         self.results.append(result)
 
         return stats
 
-    def run_all_scenarios(self, scenario_configs):
+    def run_all_scenarios(self, scenario_configs, workers=1):
         """
         Runs multiple scenarios in batch.
 
         Args:
-            scenario_configs: list of dicts with keys: 'name', 'map_file', 'robot_width', 'robot_height'
+            scenario_configs: list of dicts with keys: 'name', 'map_file', 'robot_width', 'robot_height',
+                              and optionally 'method' (search method, default "astar") and
+                              'use_potential' (potential-guided "jps", default False)
+            workers: number of worker processes (1 runs everything in this process)
         """
         self.results = []
 
+        if workers and workers > 1:
+            self._run_parallel(scenario_configs, workers)
+            return
+
         for config in scenario_configs:
             self.run_scenario(
                 map_file=config['map_file'],
                 scenario_name=config['name'],
                 robot_width=config.get('robot_width'),
-                robot_height=config.get('robot_height')
+                robot_height=config.get('robot_height'),
+                method=config.get('method', "astar"),
+                use_potential=config.get('use_potential', False),
             )
 
+        self.wait_for_renders()
+
+    def wait_for_renders(self):
+        """
+        Blocks until every queued visualization has been written and reports
+        the ones that failed.
+        """
+        if self.render_queue is None:
+            return
+
+        for error in self.render_queue.wait():
+            print(f"ERROR: rendering failed: {error}")
+
+    def _run_parallel(self, scenario_configs, workers):
+        """
+        Runs scenarios in a process pool.
+
+        Each map is loaded once here and handed to the workers through shared
+        memory. Workers buffer their console output; it is printed here in
+        scenario order together with the results.
+        """
+        shared_maps = {}
+        tasks = []
+
+        try:
+            for config in scenario_configs:
+                map_file = config['map_file']
+                if map_file not in shared_maps:
+                    shared_maps[map_file] = _share_map(map_file)
+
+                tasks.append((
+                    config['name'],
+                    map_file,
+                    config.get('robot_width'),
+                    config.get('robot_height'),
+                    config.get('method', "astar"),
+                    config.get('use_potential', False),
+                    shared_maps[map_file][1],
+                ))
+
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(self.cache.cache_dir, self.track_memory),
+            ) as pool:
+                for output, result in pool.map(_run_scenario_task, tasks):
+                    print(output, end="")
+                    self.results.append(result)
+
+        finally:
+            for shm, _ in shared_maps.values():
+                if shm is not None:
+                    shm.close()
+                    shm.unlink()
+
     def save_results(self, output_dir="evaluation"):
         """
         Saves evaluation results to JSON and CSV files.
@@ -128,8 +245,10 @@ class PerformanceEvaluator:
         # Save as CSV
         csv_file = os.path.join(output_dir, "results.csv")
         if self.results:
+            # Scenarios may report different stages, so use every key seen
+            fieldnames = list(dict.fromkeys(key for r in self.results for key in r))
             with open(csv_file, "w", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=self.results[0].keys())
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
                 writer.writeheader()
                 writer.writerows(self.results)
             print(f"Results saved to: {csv_file}")
@@ -147,7 +266,7 @@ class PerformanceEvaluator:
         print("="*100)
 
         # Header
-        header = f"{'Scenario':<25} {'Status':<10} {'Time (ms)':<12} {'Nodes':<10} {'Path Len':<12} {'Path Cost':<12}"
+        header = f"{'Scenario':<25} {'Method':<14} {'Status':<10} {'Time (ms)':<12} {'Nodes':<10} {'Path Len':<12} {'Path Cost':<12}"
         print(header)
         print("-"*100)
 
@@ -159,7 +278,7 @@ class PerformanceEvaluator:
             path_len = result['path_length'] if result['success'] else "N/A"
             path_cost = f"{result['path_cost']:.2f}" if result['success'] else "N/A"
 
-            row = f"{result['scenario_name']:<25} {status:<10} {time_ms:<12} {nodes:<10} {str(path_len):<12} {str(path_cost):<12}"
+            row = f"{result['scenario_name']:<25} {result.get('method', 'astar'):<14} {status:<10} {time_ms:<12} {nodes:<10} {str(path_len):<12} {str(path_cost):<12}"
             print(row)
 
         print("="*100)
@@ -186,6 +305,16 @@ class PerformanceEvaluator:
             avg_path_length = 0
             avg_path_cost = 0
 
+        # Average time per pipeline stage, over the scenarios that ran it
+        stage_keys = dict.fromkeys(
+            key for r in self.results for key in r
+            if key.startswith("stage_") and key.endswith("_ms")
+        )
+        avg_stage_times = {}
+        for key in stage_keys:
+            values = [r[key] for r in self.results if key in r]
+            avg_stage_times[key[len("stage_"):-len("_ms")]] = sum(values) / len(values)
+
         summary = {
             "total_scenarios": total,
             "successful": successful,
@@ -195,6 +324,7 @@ class PerformanceEvaluator:
             "avg_nodes_explored": avg_nodes,
             "avg_path_length": avg_path_length,
             "avg_path_cost": avg_path_cost,
+            "avg_stage_times_ms": avg_stage_times,
         }
 
         return summary
@@ -222,4 +352,99 @@ class PerformanceEvaluator:
         if summary['successful'] > 0:
             print(f"Average Path Length: {summary['avg_path_length']:.2f} steps")
             print(f"Average Path Cost: {summary['avg_path_cost']:.2f} units")
+        if summary['avg_stage_times_ms']:
+            print()
+            print("Average Stage Times:")
+            for name, ms in summary['avg_stage_times_ms'].items():
+                print(f"  - {name}: {ms:.2f} ms")
         print("="*60)
+
+
+# Per-process evaluator used by the parallel workers
+_worker_evaluator = None
+
+# Shared maps attached by this worker: block name -> (SharedMemory, map data)
+_worker_maps = {}
+
+
+def _init_worker(cache_dir, track_memory):
+    global _worker_evaluator
+    util.Finalize(None, _detach_maps, exitpriority=10)
+    # Scenarios already run in parallel here; render inline so each task's
+    # images are written before its result is returned
+    _worker_evaluator = PerformanceEvaluator(
+        cache=FieldCache(cache_dir=cache_dir), track_memory=track_memory,
+        background_render=False,
+    )
+
+
+def _share_map(map_file):
+    """
+    Loads a map into a shared memory block.
+
+    Returns:
+        tuple: (SharedMemory or None, descriptor passed to the workers)
+               The descriptor is None if the map could not be loaded; the
+               worker then loads it itself so the error is reported as usual.
+    """
+    try:
+        grid, start, goal = load_grid(map_file)
+    except Exception:
+        return None, None
+
+    cells = np.asarray(grid, dtype=np.uint8)
+    shm = shared_memory.SharedMemory(create=True, size=max(cells.nbytes, 1))
+    np.ndarray(cells.shape, dtype=np.uint8, buffer=shm.buf)[:] = cells
+
+    return shm, (shm.name, cells.shape, start, goal)
+
+
+def _attach_map(descriptor):
+    """
+    Returns a shared map in the (grid, start, goal) form.
+
+    The grid is a read-only view of the shared block, not a copy. Each block
+    is attached once per worker and stays attached until the worker exits.
+    """
+    name, shape, start, goal = descriptor
+
+    if name not in _worker_maps:
+        shm = shared_memory.SharedMemory(name=name)
+        cells = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+        cells.flags.writeable = False
+        _worker_maps[name] = (shm, (OccupancyGrid(cells, start, goal), start, goal))
+
+    return _worker_maps[name][1]
+
+
+def _detach_maps():
+    """Closes the shared blocks of this worker (runs when it exits)."""
+    while _worker_maps:
+        _, (shm, map_data) = _worker_maps.popitem()
+        del map_data
+        try:
+            shm.close()
+        except BufferError:
+            # A view is still referenced somewhere; the OS releases the
+            # mapping when the process ends
+            pass
+
+
+def _run_scenario_task(task):
+    """Runs one scenario in a worker; returns (console output, result dict)."""
+    scenario_name, map_file, robot_width, robot_height, method, use_potential, descriptor = task
+    map_data = _attach_map(descriptor) if descriptor is not None else None
+
+    output = io.StringIO()
+    with redirect_stdout(output):
+        _worker_evaluator.run_scenario(
+            map_file=map_file,
+            scenario_name=scenario_name,
+            robot_width=robot_width,
+            robot_height=robot_height,
+            map_data=map_data,
+            method=method,
+            use_potential=use_potential,
+        )
+
+    return output.getvalue(), _worker_evaluator.results.pop()
@@ -2,14 +2,21 @@ import matplotlib
 matplotlib.use("Agg")
 
 from map.grid_loader import load_grid
-from planner.potential_field import compute_potential_field
 from planner.path_extractor import extract_path
 from planner.statistics import PlanningStatistics
 from visualization.draw_map import draw_map
 from visualization.draw_path import draw_path
 from robot.exporter import export_path
-from robot.shape_handler import inflate_obstacles
-from config.settings import ROBOT_WIDTH, ROBOT_HEIGHT
+from planner.field_cache import FieldCache
+from planner.path_compression import compress_path
+from config.settings import (
+    ROBOT_WIDTH,
+    ROBOT_HEIGHT,
+    FIELD_CACHE_DIR,
+    COMPRESS_PATH,
+    EXPORT_FORMAT,
+    SHOW_POTENTIAL,
+)
 
 def main():
     print("\n" + "="*60)
@@ -19,8 +26,13 @@ def main():
     # Initialize statistics tracker
     stats = PlanningStatistics()
 
+    # Inflated grids and potential fields are reused across runs when a
+    # cache directory is configured
+    cache = FieldCache(cache_dir=FIELD_CACHE_DIR)
+
     # 1) Load the map
-    grid, start, goal = load_grid("map/example_map.txt")
+    with stats.stage("load"):
+        grid, start, goal = load_grid("map/example_map.txt")
     print(f"Start: {start}, Goal: {goal}")
     print(f"Robot Size: {ROBOT_HEIGHT} x {ROBOT_WIDTH} cells")
 
@@ -32,16 +44,20 @@ def main():
 
     # 3) Inflate obstacles to account for robot shape
     print("\nInflating obstacles for robot shape...")
-    inflated_grid = inflate_obstacles(grid, ROBOT_WIDTH, ROBOT_HEIGHT)
+    with stats.stage("inflate"):
+        inflated_grid = cache.get_inflated_grid(grid, ROBOT_WIDTH, ROBOT_HEIGHT, statistics=stats)
+        reachability = cache.get_reachability(grid, ROBOT_WIDTH, ROBOT_HEIGHT, statistics=stats)
 
     # 4) Compute potential field
     print("Computing potential field...")
     stats.start_timer()
-    potential = compute_potential_field(inflated_grid, goal)
+    with stats.stage("potential"):
+        potential = cache.get_potential_field(grid, goal, ROBOT_WIDTH, ROBOT_HEIGHT, statistics=stats)
 
     # 5) Extract path
     print("Extracting path...")
-    path = extract_path(potential, start, goal, statistics=stats)
+    with stats.stage("search"):
+        path = extract_path(potential, start, goal, statistics=stats, reachability=reachability)
     stats.stop_timer()
 
     # 6) Check success
@@ -53,13 +69,19 @@ def main():
         stats.set_success(False, "Did not reach goal")
         print("Warning: Path did not reach goal")
 
-    # 7) Visualize path
-    draw_path(grid, path)
+    # 7) Visualize path (over the potential field heatmap if enabled)
+    draw_path(grid, path, potential=potential if SHOW_POTENTIAL else None)
     print("Path visualization saved to path_output.png")
 
-    # 8) Export path for the robot
-    export_path(path, "robot/path_output.csv")
-    print("Path exported to robot/path_output.csv")
+    # 8) Export path for the robot, reduced to line-of-sight waypoints
+    waypoints = path
+    if COMPRESS_PATH:
+        waypoints = compress_path(path, inflated_grid)
+        print(f"Path compressed: {len(path)} cells -> {len(waypoints)} waypoints")
+
+    output_file = "robot/path_output.bin" if EXPORT_FORMAT == "binary" else "robot/path_output.csv"
+    export_path(waypoints, output_file, format=EXPORT_FORMAT)
+    print(f"Path exported to {output_file}")
 
     # 9) Print statistics
     print("\n" + stats.get_summary())
@@ -1,12 +1,28 @@
 import os
-from config.settings import START, GOAL
+import struct
+
+import numpy as np
+
+from config.settings import START, GOAL, OBSTACLE
+from map.occupancy_grid import OccupancyGrid
+
+# Binary map format:
+#   header (32 bytes, little endian): magic, version, flags, rows, cols,
+#   start row/col, goal row/col, padding
+#   body: rows * cols uint8 cells, or the obstacle bitmap packed 8 cells
+#   per byte (row-major, numpy.packbits order) when FLAG_BIT_PACKED is set
+BINARY_MAGIC = b"MNAV"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<4sBBxxIIiiii")
+BINARY_HEADER_SIZE = 32
+FLAG_BIT_PACKED = 1
 
 def load_grid(file_path):
     """
     Loads a grid map from a text file, It reads each row - Converts text → numbers - So "0 1 0 3" becomes [0, 1, 0, 3] - 
     Finds start & goal locations 
     Returns:
-        grid: 2D list of ints
+        grid: OccupancyGrid (uint8 cells, start and goal attached)
         start: (row, col)
         goal: (row, col)
     """
@@ -14,26 +30,184 @@ def load_grid(file_path):
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Map file not found: {file_path}")
 
-    grid = []
-    start = None
-    goal = None
+    rows = []
 
     with open(file_path, "r") as f:
-        for row_index, line in enumerate(f):
-            # Split each line by spaces and convert to integers
-            row = [int(x) for x in line.strip().split()]
-            grid.append(row)
-
-            # Search for start & goal in this row
-            for col_index, cell in enumerate(row):
-                if cell == START:
-                    start = (row_index, col_index)
-                elif cell == GOAL:
-                    goal = (row_index, col_index)
+        for line in f:
+            # Split each line by spaces and convert to small integers
+            if line.strip():
+                rows.append(np.array(line.split(), dtype=np.uint8))
+
+    if any(len(row) != len(rows[0]) for row in rows):
+        raise ValueError(f"Map rows have different lengths: {file_path}")
+
+    cells = np.stack(rows) if rows else np.zeros((0, 0), dtype=np.uint8)
+
+    # Search for start & goal (the last occurrence wins)
+    start = _last_position(cells, START)
+    goal = _last_position(cells, GOAL)
 
     if start is None:
         raise ValueError("Start point (2) not found in map file.")
     if goal is None:
         raise ValueError("Goal point (3) not found in map file.")
 
-    return grid, start, goal
+    return OccupancyGrid(cells, start, goal), start, goal
+
+
+def _last_position(cells, value):
+    found = np.flatnonzero(cells == value)
+    if len(found) == 0:
+        return None
+    r, c = divmod(int(found[-1]), cells.shape[1])
+    return (r, c)
+
+
+def save_grid_binary(grid, start, goal, file_path, bit_packed=False):
+    """
+    Writes a grid in the packed binary map format.
+
+    Args:
+        grid: 2D occupancy grid (nested lists or ndarray)
+        start: (row, col) start position
+        goal: (row, col) goal position
+        file_path: output file
+        bit_packed: store only the obstacle bitmap, 1 bit per cell
+    """
+    cells = np.ascontiguousarray(grid, dtype=np.uint8)
+    rows, cols = cells.shape
+
+    with open(file_path, "wb") as f:
+        _write_binary_header(f, rows, cols, start, goal, bit_packed)
+        if bit_packed:
+            f.write(np.packbits(cells == OBSTACLE).tobytes())
+        else:
+            f.write(cells.tobytes())
+
+
+def convert_text_to_binary(text_path, binary_path, bit_packed=False):
+    """
+    Converts a text map (as read by load_grid) to the binary map format.
+
+    The text file is streamed one row at a time, so the whole map never
+    has to exist as Python lists.
+    """
+    if not os.path.exists(text_path):
+        raise FileNotFoundError(f"Map file not found: {text_path}")
+
+    rows = 0
+    cols = None
+    start = None
+    goal = None
+    pending_bits = np.zeros(0, dtype=bool)
+
+    with open(text_path, "r") as src, open(binary_path, "wb") as dst:
+        # Placeholder header, rewritten once dimensions are known
+        dst.write(bytes(BINARY_HEADER_SIZE))
+
+        for line in src:
+            # Blank lines are skipped, as in load_grid
+            if not line.strip():
+                continue
+
+            row = np.array(line.split(), dtype=np.uint8)
+            if cols is None:
+                cols = len(row)
+            elif len(row) != cols:
+                raise ValueError(f"Map rows have different lengths: {text_path}")
+
+            # Same rule as load_grid: the last occurrence wins
+            if (row == START).any():
+                start = (rows, int(np.flatnonzero(row == START)[-1]))
+            if (row == GOAL).any():
+                goal = (rows, int(np.flatnonzero(row == GOAL)[-1]))
+
+            if bit_packed:
+                # Pack whole bytes only; leftover bits carry into the next row
+                pending_bits = np.concatenate([pending_bits, row == OBSTACLE])
+                whole = len(pending_bits) - len(pending_bits) % 8
+                dst.write(np.packbits(pending_bits[:whole]).tobytes())
+                pending_bits = pending_bits[whole:]
+            else:
+                dst.write(row.tobytes())
+
+            rows += 1
+
+        if bit_packed and len(pending_bits):
+            dst.write(np.packbits(pending_bits).tobytes())
+
+        if start is None:
+            raise ValueError("Start point (2) not found in map file.")
+        if goal is None:
+            raise ValueError("Goal point (3) not found in map file.")
+
+        dst.seek(0)
+        _write_binary_header(dst, rows, cols or 0, start, goal, bit_packed)
+
+
+def load_grid_binary(file_path):
+    """
+    Loads a map in the binary format.
+
+    For uint8 files the grid's cells are a read-only memory map of the file (no copy,
+    pages are read on demand). Bit-packed files are unpacked into a new
+    uint8 array with START and GOAL restored from the header. Start and goal
+    always come from the header, so no cell is scanned.
+
+    Returns:
+        grid: OccupancyGrid over the uint8 cells
+        start: (row, col)
+        goal: (row, col)
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Map file not found: {file_path}")
+
+    with open(file_path, "rb") as f:
+        header = f.read(BINARY_HEADER_SIZE)
+
+    if len(header) < BINARY_HEADER_SIZE:
+        raise ValueError(f"Not a binary map file: {file_path}")
+
+    magic, version, flags, rows, cols, sr, sc, gr, gc = BINARY_HEADER.unpack_from(header)
+    if magic != BINARY_MAGIC:
+        raise ValueError(f"Not a binary map file: {file_path}")
+    if version != BINARY_VERSION:
+        raise ValueError(f"Unsupported binary map version: {version}")
+
+    start = (sr, sc)
+    goal = (gr, gc)
+    for name, (r, c) in (("Start", start), ("Goal", goal)):
+        if not (0 <= r < rows and 0 <= c < cols):
+            raise ValueError(
+                f"{name} point {[r, c]} is outside the {rows} x {cols} map: {file_path}"
+            )
+
+    # The payload must hold exactly rows * cols cells
+    payload = os.path.getsize(file_path) - BINARY_HEADER_SIZE
+    expected = (rows * cols + 7) // 8 if flags & FLAG_BIT_PACKED else rows * cols
+    if payload != expected:
+        raise ValueError(
+            f"Binary map payload is {payload} bytes, expected {expected} "
+            f"for {rows} x {cols} cells: {file_path}"
+        )
+
+    if flags & FLAG_BIT_PACKED:
+        packed = np.memmap(file_path, dtype=np.uint8, mode="r", offset=BINARY_HEADER_SIZE)
+        bits = np.unpackbits(packed, count=rows * cols).reshape(rows, cols)
+        grid = bits * np.uint8(OBSTACLE)
+        grid[start] = START
+        grid[goal] = GOAL
+    else:
+        grid = np.memmap(
+            file_path, dtype=np.uint8, mode="r", offset=BINARY_HEADER_SIZE, shape=(rows, cols)
+        )
+
+    return OccupancyGrid(grid, start, goal), start, goal
+
+
+def _write_binary_header(f, rows, cols, start, goal, bit_packed):
+    header = BINARY_HEADER.pack(
+        BINARY_MAGIC, BINARY_VERSION, FLAG_BIT_PACKED if bit_packed else 0,
+        rows, cols, start[0], start[1], goal[0], goal[1],
+    )
+    f.write(header.ljust(BINARY_HEADER_SIZE, b"\0"))
@@ -0,0 +1,215 @@
+import numpy as np
+from config.settings import FREE, OBSTACLE, START, GOAL
+from map.occupancy_grid import OccupancyGrid
+from planner.reachability import ReachabilityIndex, label_components
+from robot.shape_handler import inflate_obstacles
+
+MAP_FAMILIES = ("open", "maze", "cluttered", "corridor", "rooms")
+
+# Largest robot (square, in cells) every generated map must connect
+# start to goal for
+MAX_ROBOT_SIZE = 5
+
+# Keep start/goal clear of this many cells so a MAX_ROBOT_SIZE robot fits
+# there after inflation
+START_CLEARANCE = 2
+
+# Width of the lane carved through random-obstacle maps; one more than the
+# robot, so the lane stays open after inflation
+LANE_WIDTH = MAX_ROBOT_SIZE + 1
+
+
+def generate_map(family, rows, cols=None, seed=0):
+    """
+    Generates a procedural test map.
+
+    Args:
+        family: one of MAP_FAMILIES
+        rows: number of rows
+        cols: number of columns (default: same as rows)
+        seed: random seed; the same (family, size, seed) always gives the
+              same map
+
+    Raises:
+        ValueError: if the family is unknown, or the map has no route from
+                    start to goal for a MAX_ROBOT_SIZE robot
+
+    Returns:
+        grid: OccupancyGrid with START and GOAL marked
+        start: (row, col) near the top-left corner
+        goal: (row, col) near the bottom-right corner
+    """
+    if cols is None:
+        cols = rows
+
+    rng = np.random.default_rng(seed)
+
+    if family == "open":
+        grid = _random_obstacles(rng, rows, cols, density=0.02)
+    elif family == "cluttered":
+        grid = _random_obstacles(rng, rows, cols, density=0.1)
+    elif family == "maze":
+        grid = _maze(rng, rows, cols)
+    elif family == "corridor":
+        grid = _corridors(rng, rows, cols)
+    elif family == "rooms":
+        grid = _rooms(rng, rows, cols)
+    else:
+        raise ValueError(f"Unknown map family: {family}")
+
+    start = _nearest_clear_cell(grid, (0, 0))
+    goal = _nearest_clear_cell(grid, (rows - 1, cols - 1))
+    grid[start] = START
+    grid[goal] = GOAL
+
+    grid = OccupancyGrid(grid, start, goal)
+
+    # A disconnected map would only time the early unreachable exit
+    inflated = inflate_obstacles(grid, MAX_ROBOT_SIZE, MAX_ROBOT_SIZE)
+    failure = ReachabilityIndex(label_components(inflated)).check(start, goal)
+    if failure is not None:
+        raise ValueError(
+            f"Generated {family} map ({rows}x{cols}, seed {seed}) has no route "
+            f"for a {MAX_ROBOT_SIZE}x{MAX_ROBOT_SIZE} robot: {failure}"
+        )
+
+    return grid, start, goal
+
+
+def _random_obstacles(rng, rows, cols, density):
+    """Random obstacles with a lane from corner to corner carved through them."""
+    grid = np.where(rng.random((rows, cols)) < density, OBSTACLE, FREE).astype(np.uint8)
+    _carve_lane(rng, grid)
+    return grid
+
+
+def _carve_lane(rng, grid, width=LANE_WIDTH):
+    """
+    Clears a staircase lane from the top-left to the bottom-right corner:
+    horizontal and vertical legs of random length, each width cells wide.
+    """
+    rows, cols = grid.shape
+    width = min(width, rows, cols)
+    last_r, last_c = rows - width, cols - width
+    r = c = 0
+
+    while (r, c) != (last_r, last_c):
+        next_c = min(last_c, c + int(rng.integers(width, max(width, cols // 4) + 1)))
+        grid[r:r + width, c:next_c + width] = FREE
+        c = next_c
+
+        next_r = min(last_r, r + int(rng.integers(width, max(width, rows // 4) + 1)))
+        grid[r:next_r + width, c:c + width] = FREE
+        r = next_r
+
+    grid[r:r + width, c:c + width] = FREE
+
+
+def _maze(rng, rows, cols, corridor=6, wall=2):
+    """Recursive-backtracker maze with corridors wide enough for a 5x5 robot."""
+    grid = np.full((rows, cols), OBSTACLE, dtype=np.uint8)
+    pitch = corridor + wall
+    cells_r = max(1, (rows - wall) // pitch)
+    cells_c = max(1, (cols - wall) // pitch)
+
+    def carve(cr, cc):
+        r0, c0 = wall + cr * pitch, wall + cc * pitch
+        grid[r0:r0 + corridor, c0:c0 + corridor] = FREE
+
+    visited = np.zeros((cells_r, cells_c), dtype=bool)
+    stack = [(0, 0)]
+    visited[0, 0] = True
+    carve(0, 0)
+
+    while stack:
+        cr, cc = stack[-1]
+        options = [
+            (cr + dr, cc + dc) for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1))
+            if 0 <= cr + dr < cells_r and 0 <= cc + dc < cells_c and not visited[cr + dr, cc + dc]
+        ]
+        if not options:
+            stack.pop()
+            continue
+
+        nr, nc = options[rng.integers(len(options))]
+        visited[nr, nc] = True
+        carve(nr, nc)
+
+        # Remove the wall between the two cells
+        r0 = wall + min(cr, nr) * pitch
+        c0 = wall + min(cc, nc) * pitch
+        if nr != cr:
+            grid[r0:r0 + 2 * corridor + wall, c0:c0 + corridor] = FREE
+        else:
+            grid[r0:r0 + corridor, c0:c0 + 2 * corridor + wall] = FREE
+
+        stack.append((nr, nc))
+
+    return grid
+
+
+def _corridors(rng, rows, cols, corridor=6, wall=2):
+    """Serpentine: horizontal corridors joined by a gap at alternating ends."""
+    grid = np.zeros((rows, cols), dtype=np.uint8)
+    pitch = corridor + wall
+
+    for i, r in enumerate(range(corridor, rows - wall, pitch)):
+        grid[r:r + wall, :] = OBSTACLE
+        gap = int(rng.integers(corridor, 2 * corridor + 1))
+        if i % 2 == 0:
+            grid[r:r + wall, cols - gap:] = FREE
+        else:
+            grid[r:r + wall, :gap] = FREE
+
+    return grid
+
+
+def _rooms(rng, rows, cols, room=20, wall=1, door=6):
+    """Grid of rooms separated by walls, each wall segment with one door."""
+    grid = np.zeros((rows, cols), dtype=np.uint8)
+
+    for r in range(room, rows, room):
+        grid[r:r + wall, :] = OBSTACLE
+    for c in range(room, cols, room):
+        grid[:, c:c + wall] = OBSTACLE
+
+    # One door in every wall segment between two neighbouring rooms
+    for r in range(room, rows, room):
+        for c0 in range(0, cols, room):
+            span = min(cols, c0 + room) - c0 - wall
+            if span > door:
+                d = c0 + wall + int(rng.integers(0, span - door))
+                grid[r:r + wall, d:d + door] = FREE
+    for c in range(room, cols, room):
+        for r0 in range(0, rows, room):
+            span = min(rows, r0 + room) - r0 - wall
+            if span > door:
+                d = r0 + wall + int(rng.integers(0, span - door))
+                grid[d:d + door, c:c + wall] = FREE
+
+    return grid
+
+
+def _nearest_clear_cell(grid, corner):
+    """Free cell closest to corner whose surrounding square is obstacle-free."""
+    rows, cols = grid.shape
+    k = START_CLEARANCE
+
+    blocked = grid == OBSTACLE
+    padded = np.pad(blocked, k, constant_values=True)
+
+    # Any obstacle (or map edge) within k cells in either direction
+    near = np.zeros_like(blocked)
+    for dr in range(-k, k + 1):
+        for dc in range(-k, k + 1):
+            near |= padded[k + dr:k + dr + rows, k + dc:k + dc + cols]
+
+    candidates = np.argwhere(~near)
+    if len(candidates) == 0:
+        candidates = np.argwhere(~blocked)
+    if len(candidates) == 0:
+        raise ValueError("Generated map has no free cells.")
+
+    distances = np.abs(candidates - np.array(corner)).max(axis=1)
+    r, c = candidates[np.argmin(distances)]
+    return (int(r), int(c))
@@ -0,0 +1,129 @@
+import hashlib
+
+import numpy as np
+from config.settings import OBSTACLE
+
+
+class OccupancyGrid:
+    """
+    Occupancy grid backed by one contiguous uint8 array.
+
+    Behaves like the nested-list grid it replaces (len(grid), grid[r][c],
+    iterating over rows) and like an array (grid[r, c], grid.shape,
+    np.asarray(grid) without a copy), so modules accept either form.
+    Derived data that is expensive to recompute, the obstacle count and the
+    content digest, is cached on first use.
+
+    Write cells through grid[r, c] = value (or grid[r0:r1, c0:c1] = ...),
+    which drops the cached data. Rows and other sub-arrays read from the
+    grid are read-only views, so writing through one (grid[r][c] = value)
+    raises instead of leaving the cached digest stale.
+    """
+
+    __slots__ = ("cells", "start", "goal", "_obstacle_count", "_digest")
+
+    def __init__(self, cells, start=None, goal=None):
+        """
+        Args:
+            cells: 2D grid (nested lists, ndarray or OccupancyGrid)
+            start: (row, col) start position, if known
+            goal: (row, col) goal position, if known
+        """
+        if isinstance(cells, OccupancyGrid):
+            start = cells.start if start is None else start
+            goal = cells.goal if goal is None else goal
+            cells = cells.cells
+
+        self.cells = np.ascontiguousarray(cells, dtype=np.uint8)
+        if self.cells.ndim != 2:
+            raise ValueError(f"Occupancy grid must be 2D, got shape {self.cells.shape}")
+
+        self.start = start
+        self.goal = goal
+        self._obstacle_count = None
+        self._digest = None
+
+    @property
+    def shape(self):
+        return self.cells.shape
+
+    @property
+    def nbytes(self):
+        return self.cells.nbytes
+
+    @property
+    def obstacle_count(self):
+        """Number of obstacle cells (cached)."""
+        if self._obstacle_count is None:
+            self._obstacle_count = int(np.count_nonzero(self.cells == OBSTACLE))
+        return self._obstacle_count
+
+    @property
+    def digest(self):
+        """Content hash of the cells (cached; see cells_digest)."""
+        if self._digest is None:
+            self._digest = cells_digest(self.cells)
+        return self._digest
+
+    def tolist(self):
+        """Returns the cells as nested lists (for per-cell Python loops)."""
+        return self.cells.tolist()
+
+    def copy(self):
+        return OccupancyGrid(self.cells.copy(), self.start, self.goal)
+
+    def __len__(self):
+        return self.cells.shape[0]
+
+    def __iter__(self):
+        return iter(_read_only(self.cells))
+
+    def __getitem__(self, key):
+        value = self.cells[key]
+        if isinstance(value, np.ndarray):
+            return _read_only(value)
+        return value
+
+    def __setitem__(self, key, value):
+        self.cells[key] = value
+        self._obstacle_count = None
+        self._digest = None
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is not None and dtype != self.cells.dtype:
+            return self.cells.astype(dtype)
+        return self.cells.copy() if copy else self.cells
+
+    def __repr__(self):
+        rows, cols = self.cells.shape
+        return f"OccupancyGrid({rows} x {cols}, start={self.start}, goal={self.goal})"
+
+
+def _read_only(array):
+    """Read-only view of an array (the array itself stays writable)."""
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+def cells_digest(cells):
+    """
+    Content hash of a 2D grid (shape and cell values).
+    """
+    cells = np.ascontiguousarray(cells, dtype=np.uint8)
+    h = hashlib.sha256()
+    h.update(repr(cells.shape).encode())
+    h.update(cells.tobytes())
+    return h.hexdigest()
+
+
+def grid_rows(grid):
+    """
+    Returns a grid as nested lists.
+
+    Per-cell Python loops run much faster on lists of ints than on numpy
+    scalars, so array-backed grids are converted once before such loops.
+    """
+    if hasattr(grid, "tolist"):
+        return grid.tolist()
+    return grid
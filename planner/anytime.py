@@ -0,0 +1,202 @@
+import time
+from heapq import heapify, heappush, heappop
+
+from config.settings import ANYTIME_DEADLINE_MS, ANYTIME_INITIAL_WEIGHT, ANYTIME_WEIGHT_STEP
+from planner.path_extractor import (
+    flat_moves,
+    octile_distance,
+    _field_shape,
+    _flat_values,
+    _record_heap_counters,
+)
+
+# Heap pops between two looks at the clock
+CLOCK_INTERVAL = 64
+
+# Cost and bound changes smaller than this (relative) are rounding noise
+IMPROVEMENT_TOLERANCE = 1e-9
+
+
+def anytime_search(potential, start, goal, deadline_ms=None, statistics=None,
+                   initial_weight=None, weight_step=None):
+    """
+    Anytime Repairing A* (ARA*) with a wall-clock budget.
+
+    The first solution comes from A* with the octile heuristic inflated by
+    initial_weight, which is found quickly and costs at most that factor more
+    than the optimum. The weight is then lowered step by step down to 1.0;
+    each step reuses the previous search (only cells whose cost improved are
+    expanded again) and may produce a cheaper path. The search stops at the
+    deadline or once a solution is proven optimal.
+
+    Every pass that improves the path or its bound is recorded in statistics
+    with the cost, the suboptimality bound and the time it finished. If the
+    deadline passes before any solution, the path to the explored cell
+    closest to the goal is returned instead, so the caller always gets a
+    cycle-free prefix.
+
+    Args:
+        potential: 2D potential field (inf marks obstacles)
+        start: (row, col) starting position
+        goal: (row, col) goal position
+        deadline_ms: wall-clock budget (default: ANYTIME_DEADLINE_MS)
+        statistics: PlanningStatistics object (optional)
+        initial_weight: heuristic weight of the first pass
+                        (default: ANYTIME_INITIAL_WEIGHT)
+        weight_step: weight decrease per pass (default: ANYTIME_WEIGHT_STEP)
+
+    Returns:
+        tuple: (path, nodes_explored); path ends at goal unless the budget
+               ran out first
+    """
+    # The budget covers the whole call, setup included
+    started = time.perf_counter()
+
+    if deadline_ms is None:
+        deadline_ms = ANYTIME_DEADLINE_MS
+    if initial_weight is None:
+        initial_weight = ANYTIME_INITIAL_WEIGHT
+    if weight_step is None:
+        weight_step = ANYTIME_WEIGHT_STEP
+
+    deadline = started + deadline_ms / 1000
+
+    rows, cols = _field_shape(potential)
+    values = _flat_values(potential)
+    inf = float("inf")
+
+    start_index = start[0] * cols + start[1]
+    goal_index = goal[0] * cols + goal[1]
+
+    if start_index == goal_index:
+        return [tuple(start)], 1
+    if values[goal_index] == inf:
+        return [], 0
+
+    def heuristic(index):
+        return octile_distance(index // cols - goal[0], index % cols - goal[1])
+
+    moves = flat_moves(cols)
+
+    g_scores = {start_index: 0.0}
+    parents = {start_index: -1}
+    open_cells = {start_index}
+    closed = set()
+    incons = set()
+
+    weight = initial_weight
+    open_set = [(weight * heuristic(start_index), 0.0, start_index)]
+
+    best_path = []
+    best_cost = inf
+    best_bound = inf
+    closest, closest_h = start_index, heuristic(start_index)
+
+    nodes_explored = 0
+    pushes = 1
+    pops = 0
+    timed_out = False
+
+    while True:
+        # One ARA* pass: expand until no open cell can improve the goal
+        while open_set and g_scores.get(goal_index, inf) > open_set[0][0]:
+            if pops % CLOCK_INTERVAL == 0 and time.perf_counter() >= deadline:
+                timed_out = True
+                break
+
+            _, g, current = heappop(open_set)
+            pops += 1
+
+            # Outdated entry: expanded already, or reached more cheaply since
+            if current not in open_cells or g > g_scores[current]:
+                continue
+
+            open_cells.discard(current)
+            closed.add(current)
+            nodes_explored += 1
+
+            h = heuristic(current)
+            if h < closest_h:
+                closest, closest_h = current, h
+
+            r, c = divmod(current, cols)
+            for dr, dc, offset, move_cost in moves:
+                nr, nc = r + dr, c + dc
+                if not (0 <= nr < rows and 0 <= nc < cols):
+                    continue
+
+                neighbor = current + offset
+                if values[neighbor] == inf:
+                    continue
+
+                tentative = g + move_cost
+                if tentative < g_scores.get(neighbor, inf):
+                    g_scores[neighbor] = tentative
+                    parents[neighbor] = current
+                    if neighbor in closed:
+                        incons.add(neighbor)
+                    else:
+                        open_cells.add(neighbor)
+                        heappush(open_set, (tentative + weight * heuristic(neighbor), tentative, neighbor))
+                        pushes += 1
+
+        if timed_out:
+            break
+
+        goal_cost = g_scores.get(goal_index, inf)
+        if goal_cost == inf:
+            # The open list ran dry: the goal is unreachable
+            break
+
+        # Suboptimality bound of this pass (ARA*'s epsilon')
+        pending = open_cells | incons
+        lower_bound = min((g_scores[i] + heuristic(i) for i in pending), default=goal_cost)
+        bound = max(1.0, min(weight, goal_cost / lower_bound)) if lower_bound > 0 else 1.0
+        if bound - 1.0 <= IMPROVEMENT_TOLERANCE:
+            bound = 1.0
+
+        # Record the pass if it found a cheaper path or a tighter bound
+        cheaper = goal_cost < best_cost * (1.0 - IMPROVEMENT_TOLERANCE)
+        tighter = bound < best_bound - IMPROVEMENT_TOLERANCE
+        if cheaper or tighter:
+            if cheaper:
+                best_cost = goal_cost
+                best_path = _follow_parents(parents, goal_index, cols)
+            if tighter:
+                best_bound = bound
+            if statistics:
+                statistics.record_solution(
+                    best_cost, best_bound, (time.perf_counter() - started) * 1000
+                )
+
+        if bound == 1.0 or time.perf_counter() >= deadline:
+            break
+
+        # Next pass: lower the weight and reopen every inconsistent cell
+        weight = max(1.0, weight - weight_step)
+        open_cells |= incons
+        incons = set()
+        closed = set()
+        open_set = [
+            (g_scores[i] + weight * heuristic(i), g_scores[i], i) for i in open_cells
+        ]
+        heapify(open_set)
+        pushes += len(open_set)
+
+    _record_heap_counters(statistics, pushes, pops, 0)
+
+    if best_path:
+        return best_path, nodes_explored
+    if timed_out:
+        return _follow_parents(parents, closest, cols), nodes_explored
+    return [], nodes_explored
+
+
+def _follow_parents(parents, index, cols):
+    """Returns the (row, col) path from the start to index."""
+    path = []
+    while index != -1:
+        path.append(divmod(index, cols))
+        index = parents[index]
+    path.reverse()
+    return path
@@ -0,0 +1,266 @@
+import time
+from heapq import heappush, heappop
+
+import numpy as np
+
+from config.settings import OBSTACLE
+from planner.path_extractor import NEIGHBORS, flat_moves, move_cost
+from planner.statistics import PlanningStatistics
+from robot.shape_handler import inflate_obstacles, robot_dimensions
+from robot.inflation_pyramid import InflationPyramid
+
+
+class CostToGoField:
+    """
+    Cost-to-go from every cell to a single goal.
+
+    Built with one reverse Dijkstra pass from the goal over the inflated
+    grid, using the same move costs as astar_search (1.0 straight, 1.414
+    diagonal). Every reached cell stores its successor on a shortest route
+    to the goal, so the path for any start is read out in O(path length).
+    """
+
+    def __init__(self, inflated_grid, goal):
+        cells = np.asarray(inflated_grid)
+        self.rows, self.cols = cells.shape
+        self.goal = goal
+
+        self.costs = [float("inf")] * (self.rows * self.cols)
+        self.successors = [-1] * (self.rows * self.cols)
+        self.nodes_explored = 0
+
+        # A goal inside an inflated obstacle cannot be reached from anywhere
+        if not self._in_bounds(goal) or cells[goal[0], goal[1]] == OBSTACLE:
+            return
+
+        blocked = memoryview((cells == OBSTACLE).view(np.uint8).ravel())
+        self.costs, self.successors, self.nodes_explored = dijkstra(
+            blocked, self.rows, self.cols, goal
+        )
+
+    def cost(self, start):
+        """Shortest travel cost from start to the goal (inf if unreachable)."""
+        return self._first_step(start)[1]
+
+    def path_from(self, start):
+        """
+        Returns the shortest path from start to the goal as (row, col)
+        tuples, or [] if the goal cannot be reached from start.
+        """
+        index, cost = self._first_step(start)
+        if cost == float("inf"):
+            return []
+
+        path = []
+        if index != start[0] * self.cols + start[1]:
+            path.append(tuple(start))
+
+        while index != -1:
+            path.append(divmod(index, self.cols))
+            index = self.successors[index]
+        return path
+
+    def _first_step(self, start):
+        """
+        Returns (flat index, cost) of the first cell on the route from start.
+
+        Like astar_search, a start inside an inflated obstacle may still step
+        out onto a free neighbor; in that case the neighbor is returned.
+        """
+        inf = float("inf")
+        if not self._in_bounds(start):
+            return -1, inf
+
+        index = start[0] * self.cols + start[1]
+        if tuple(start) == tuple(self.goal):
+            return index, 0.0
+        if self.costs[index] != inf:
+            return index, self.costs[index]
+
+        best_index, best_cost = -1, inf
+        for dr, dc in NEIGHBORS:
+            neighbor = (start[0] + dr, start[1] + dc)
+            if not self._in_bounds(neighbor):
+                continue
+            step_cost = move_cost(dr, dc)
+            n_index = neighbor[0] * self.cols + neighbor[1]
+            if self.costs[n_index] + step_cost < best_cost:
+                best_index, best_cost = n_index, self.costs[n_index] + step_cost
+
+        return best_index, best_cost
+
+    def _in_bounds(self, position):
+        return 0 <= position[0] < self.rows and 0 <= position[1] < self.cols
+
+
+def plan_many(grid, starts, goal, robot_size=None, inflated_grid=None):
+    """
+    Plans paths from many starts to one shared goal.
+
+    The inflated grid and the cost-to-go field are computed once; each start
+    then only pays for reading its path out of the field. The field's build
+    time and Dijkstra expansions are amortized over the starts, so the
+    statistics of a batch add up to its total work.
+
+    Args:
+        grid: 2D occupancy grid (uninflated)
+        starts: list of (row, col) start positions
+        goal: (row, col) goal position shared by all starts
+        robot_size: (height, width) in grid cells (default from settings)
+        inflated_grid: precomputed inflated grid for this robot size (optional)
+
+    Returns:
+        list of (path, PlanningStatistics) tuples, one per start, in order
+    """
+    robot_height, robot_width = robot_dimensions(robot_size)
+
+    if inflated_grid is None:
+        inflated_grid = inflate_obstacles(grid, robot_width, robot_height)
+
+    field_start = time.perf_counter()
+    field = CostToGoField(inflated_grid, goal)
+    field_time = time.perf_counter() - field_start
+
+    # The shared field is paid for once and amortized over the batch; its
+    # expansions are split so that they add up to the Dijkstra's total
+    shared_time = field_time / len(starts) if starts else 0.0
+    shared_nodes, extra_nodes = divmod(field.nodes_explored, len(starts)) if starts else (0, 0)
+
+    results = []
+    for i, start in enumerate(starts):
+        stats = PlanningStatistics()
+        stats.set_map_info(grid, robot_width, robot_height)
+
+        readout_start = time.perf_counter()
+        path = field.path_from(start)
+        stats.planning_time = shared_time + (time.perf_counter() - readout_start)
+
+        # No search runs per start: the readout only follows successors
+        stats.nodes_explored = shared_nodes + (1 if i < extra_nodes else 0)
+
+        if path:
+            stats.set_success(True)
+            stats.set_path_info(path)
+        else:
+            stats.set_success(False, "Goal not reachable from start")
+
+        results.append((path, stats))
+
+    return results
+
+
+def plan_batch(grid, requests):
+    """
+    Plans a mixed batch of requests on one map.
+
+    Requests sharing the same goal and robot size are grouped and answered
+    from a single cost-to-go field; inflated grids are shared between groups
+    with the same robot size and all cut from one inflation pyramid.
+
+    Args:
+        grid: 2D occupancy grid (uninflated)
+        requests: list of dicts with keys 'start', 'goal' and optionally
+                  'robot_size' as (height, width)
+
+    Returns:
+        list of (path, PlanningStatistics) tuples in request order
+    """
+    groups = {}
+    for i, request in enumerate(requests):
+        key = (tuple(request["goal"]), robot_dimensions(request.get("robot_size")))
+        groups.setdefault(key, []).append(i)
+
+    pyramid = InflationPyramid(grid)
+    inflated_grids = {}
+    results = [None] * len(requests)
+
+    for (goal, robot_size), indices in groups.items():
+        if robot_size not in inflated_grids:
+            inflated_grids[robot_size] = pyramid.inflated(robot_size[1], robot_size[0])
+
+        starts = [tuple(requests[i]["start"]) for i in indices]
+        group_results = plan_many(
+            grid, starts, goal, robot_size, inflated_grid=inflated_grids[robot_size]
+        )
+
+        for i, result in zip(indices, group_results):
+            results[i] = result
+
+    return results
+
+
+def dijkstra(blocked, rows, cols, origin, targets=None, endpoints=()):
+    """
+    Dijkstra from origin over a flat blocked-cell mask, with the move costs
+    of astar_search.
+
+    The origin is expanded even if it is blocked. Blocked cells in endpoints
+    may be entered but are not expanded further. Moves cost the same both
+    ways, so a search from the goal gives the cost-to-go of every cell.
+
+    Args:
+        blocked: flat sequence indexed by row * cols + col, true on blocked
+                 cells (a list, or a memoryview of a uint8 mask)
+        rows, cols: grid shape
+        origin: (row, col) the search starts from
+        targets: flat indices to settle (optional); the search stops once
+                 all of them that can be reached are settled, otherwise it
+                 covers everything reachable
+        endpoints: flat indices of blocked cells that may be entered
+
+    Returns:
+        tuple: (costs, parents, nodes_explored) where costs and parents are
+               flat lists; parents lead back to the origin (-1 there and on
+               unreached cells). Costs of settled cells are final, so with
+               targets every reachable target has its exact cost.
+    """
+    inf = float("inf")
+    costs = [inf] * (rows * cols)
+    parents = [-1] * (rows * cols)
+    nodes_explored = 0
+
+    origin_index = origin[0] * cols + origin[1]
+    costs[origin_index] = 0.0
+    open_set = [(0.0, origin_index)]
+
+    endpoints = set(endpoints)
+    remaining = None
+    if targets is not None:
+        # Blocked targets that are not endpoints are never reached
+        remaining = {
+            i for i in targets if not blocked[i] or i in endpoints or i == origin_index
+        }
+
+    moves = flat_moves(cols)
+
+    while open_set:
+        cost, current = heappop(open_set)
+        if cost > costs[current]:
+            continue
+
+        if remaining is not None:
+            remaining.discard(current)
+            if not remaining:
+                break
+        if current in endpoints and current != origin_index:
+            continue
+
+        nodes_explored += 1
+        r, c = divmod(current, cols)
+
+        for dr, dc, offset, step_cost in moves:
+            nr, nc = r + dr, c + dc
+            if not (0 <= nr < rows and 0 <= nc < cols):
+                continue
+
+            neighbor = current + offset
+            if blocked[neighbor] and neighbor not in endpoints:
+                continue
+
+            new_cost = cost + step_cost
+            if new_cost < costs[neighbor]:
+                costs[neighbor] = new_cost
+                parents[neighbor] = current
+                heappush(open_set, (new_cost, neighbor))
+
+    return costs, parents, nodes_explored
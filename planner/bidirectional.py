@@ -0,0 +1,139 @@
+from heapq import heappush, heappop
+
+from planner.path_extractor import (
+    flat_moves,
+    octile_distance,
+    _field_shape,
+    _flat_values,
+    _record_heap_counters,
+)
+
+
+def bidirectional_search(potential, start, goal, statistics=None):
+    """
+    Bidirectional A* on the cells the potential field marks as free.
+
+    A forward search from start and a backward search from goal run on the
+    same field, always advancing the side with the smaller open list. Both
+    use the balanced potential p(n) = (h_goal(n) - h_start(n)) / 2 built from
+    octile distances (h_goal for the forward side, -p for the backward
+    side), which keeps the two searches consistent with each other: every
+    cell is settled at most once per side, and the search may stop as soon
+    as the two smallest keys add up to the best meeting cost found so far.
+    The returned path is then shortest for the move costs of astar_search
+    (1.0 straight, 1.414 diagonal).
+
+    If either side runs out of cells before the two meet, no path exists and
+    an empty path is returned straight away, usually after far fewer
+    expansions than a one-sided search needs to prove it.
+
+    Args:
+        potential: 2D potential field (inf marks obstacles)
+        start: (row, col) starting position
+        goal: (row, col) goal position
+        statistics: PlanningStatistics object (optional); receives heap
+                    counters for both sides
+
+    Returns:
+        tuple: (path, nodes_explored) with expansions of both sides
+    """
+    rows, cols = _field_shape(potential)
+    values = _flat_values(potential)
+    inf = float("inf")
+
+    start_index = start[0] * cols + start[1]
+    goal_index = goal[0] * cols + goal[1]
+
+    if start_index == goal_index:
+        return [tuple(start)], 1
+    if values[goal_index] == inf:
+        return [], 0
+
+    def octile(index, target):
+        return octile_distance(index // cols - target[0], index % cols - target[1])
+
+    def balance(index):
+        return (octile(index, goal) - octile(index, start)) / 2
+
+    moves = flat_moves(cols)
+
+    # Index 0 is the forward side, 1 the backward side
+    g_scores = ({start_index: 0.0}, {goal_index: 0.0})
+    parents = ({start_index: -1}, {goal_index: -1})
+    settled = (set(), set())
+    open_sets = (
+        [(balance(start_index), 0.0, start_index)],
+        [(-balance(goal_index), 0.0, goal_index)],
+    )
+    signs = (1, -1)
+
+    best_cost = inf
+    meeting = -1
+    nodes_explored = 0
+    pushes = 2
+    pops = 0
+
+    while open_sets[0] and open_sets[1]:
+        # Stop once no unexplored route can beat the best meeting found
+        if open_sets[0][0][0] + open_sets[1][0][0] >= best_cost:
+            break
+
+        side = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+        open_set = open_sets[side]
+        own_g, other_g = g_scores[side], g_scores[1 - side]
+        sign = signs[side]
+
+        _, g, current = heappop(open_set)
+        pops += 1
+        if current in settled[side]:
+            continue
+        settled[side].add(current)
+        nodes_explored += 1
+
+        r, c = divmod(current, cols)
+        for dr, dc, offset, move_cost in moves:
+            nr, nc = r + dr, c + dc
+            if not (0 <= nr < rows and 0 <= nc < cols):
+                continue
+
+            neighbor = current + offset
+
+            # Forward moves may only enter free cells; the backward side may
+            # also step onto the start, which a robot can always leave
+            if values[neighbor] == inf and not (side == 1 and neighbor == start_index):
+                continue
+
+            tentative = g + move_cost
+            if tentative < own_g.get(neighbor, inf):
+                own_g[neighbor] = tentative
+                parents[side][neighbor] = current
+                heappush(open_set, (tentative + sign * balance(neighbor), tentative, neighbor))
+                pushes += 1
+
+                if neighbor in other_g and tentative + other_g[neighbor] < best_cost:
+                    best_cost = tentative + other_g[neighbor]
+                    meeting = neighbor
+
+    _record_heap_counters(statistics, pushes, pops, 0)
+
+    if meeting == -1:
+        return [], nodes_explored
+
+    return _stitch(parents, meeting, cols), nodes_explored
+
+
+def _stitch(parents, meeting, cols):
+    """Joins the forward half (start .. meeting) and backward half (meeting .. goal)."""
+    forward = []
+    node = meeting
+    while node != -1:
+        forward.append(divmod(node, cols))
+        node = parents[0][node]
+    forward.reverse()
+
+    node = parents[1][meeting]
+    while node != -1:
+        forward.append(divmod(node, cols))
+        node = parents[1][node]
+
+    return forward
@@ -0,0 +1,212 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, util
+
+import numpy as np
+
+from config.settings import OBSTACLE, DISTANCE_MATRIX_WORKERS, DISTANCE_MATRIX_PARALLEL_CELLS
+from planner.batch_planner import dijkstra
+from robot.shape_handler import inflate_obstacles, robot_dimensions
+
+
+def distance_matrix(grid, sources, targets, robot_size=None, return_paths=False,
+                    inflated_grid=None, pool=None):
+    """
+    Travel cost from every source to every target.
+
+    Runs one Dijkstra search per source that stops once all targets are
+    settled, or one per target back to the sources when there are fewer
+    targets (moves cost the same both ways: 1.0 straight, 1.414 diagonal,
+    as in astar_search). As in astar_search, a source inside an inflated
+    obstacle may step out onto a free neighbour, while a target inside one
+    is unreachable.
+
+    With a SearchPool, the searches run in its worker processes, unless the
+    job is too small to pay for the hand-off (fewer than
+    DISTANCE_MATRIX_PARALLEL_CELLS map cells times searches).
+
+    Args:
+        grid: 2D occupancy grid (uninflated)
+        sources: list of (row, col) positions, e.g. robots
+        targets: list of (row, col) positions, e.g. pickup stations
+        robot_size: (height, width) in grid cells (default from settings)
+        return_paths: also return the shortest paths
+        inflated_grid: precomputed inflated grid for this robot size (optional)
+        pool: SearchPool to run the searches in (optional; without one,
+              every search runs in this process)
+
+    Returns:
+        matrix: list of rows, matrix[i][j] is the cost from sources[i] to
+                targets[j] (inf if unreachable); with return_paths, the
+                tuple (matrix, paths) where paths[i][j] is the list of
+                (row, col) cells from sources[i] to targets[j] ([] if
+                unreachable)
+    """
+    robot_height, robot_width = robot_dimensions(robot_size)
+    if inflated_grid is None:
+        inflated_grid = inflate_obstacles(grid, robot_width, robot_height)
+
+    blocked = np.ascontiguousarray(np.asarray(inflated_grid) == OBSTACLE, dtype=np.uint8)
+    rows, cols = blocked.shape
+
+    sources = [tuple(s) for s in sources]
+    targets = [tuple(t) for t in targets]
+    for name, cells in (("source", sources), ("target", targets)):
+        for r, c in cells:
+            if not (0 <= r < rows and 0 <= c < cols):
+                raise ValueError(f"{name} {[r, c]} is outside the {rows} x {cols} map.")
+
+    # Search from the smaller side
+    reverse = len(targets) < len(sources)
+    origins, goals = (targets, sources) if reverse else (sources, targets)
+    tasks = [(origin, goals, reverse, return_paths) for origin in origins]
+
+    if pool is not None and len(tasks) > 1 and rows * cols * len(tasks) >= DISTANCE_MATRIX_PARALLEL_CELLS:
+        results = pool.run(blocked, tasks)
+    else:
+        flat = memoryview(blocked.ravel())
+        results = [_search(flat, rows, cols, *task) for task in tasks]
+
+    # One result row per origin; transpose when the targets were the origins
+    if reverse:
+        matrix = [[results[j][0][i] for j in range(len(targets))] for i in range(len(sources))]
+        paths = [[results[j][1][i] for j in range(len(targets))] for i in range(len(sources))] \
+            if return_paths else None
+    else:
+        matrix = [result[0] for result in results]
+        paths = [result[1] for result in results] if return_paths else None
+
+    if return_paths:
+        return matrix, paths
+    return matrix
+
+
+class SearchPool:
+    """
+    Worker processes for distance_matrix, kept between calls.
+
+    Starting processes costs more than a small matrix, so a caller answering
+    many requests (e.g. the planning server) creates one pool and passes it
+    to every call. Each call hands its blocked-cell mask to the workers in
+    one shared memory block, which they read in place rather than copy.
+    """
+
+    def __init__(self, workers=None):
+        """
+        Args:
+            workers: worker processes (default: DISTANCE_MATRIX_WORKERS)
+        """
+        if workers is None:
+            workers = DISTANCE_MATRIX_WORKERS
+
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+    def run(self, blocked, tasks):
+        """
+        Runs searches on a blocked-cell mask in the workers.
+
+        Args:
+            blocked: 2D uint8 array, 1 on blocked cells
+            tasks: list of (origin, goals, reverse, return_paths) tuples
+
+        Returns:
+            list of (costs, paths) results in task order (see _search)
+        """
+        rows, cols = blocked.shape
+        shm = shared_memory.SharedMemory(create=True, size=max(blocked.nbytes, 1))
+        try:
+            np.ndarray(blocked.shape, dtype=np.uint8, buffer=shm.buf)[:] = blocked
+            return list(self.executor.map(
+                _search_task, [(shm.name, rows, cols, *task) for task in tasks]
+            ))
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def close(self):
+        """Stops the workers once the running searches have finished."""
+        self.executor.shutdown(cancel_futures=True)
+
+
+# Shared mask attached by this worker: (block name, SharedMemory, read-only view)
+_worker_mask = None
+
+
+def _init_worker():
+    util.Finalize(None, _detach_mask, exitpriority=10)
+
+
+def _search_task(task):
+    name, rows, cols = task[:3]
+    return _search(_attach_mask(name), rows, cols, *task[3:])
+
+
+def _attach_mask(name):
+    """
+    Returns a read-only view of a shared mask. Only the mask of the current
+    call stays attached; a task from another call replaces it.
+    """
+    global _worker_mask
+
+    if _worker_mask is None or _worker_mask[0] != name:
+        _detach_mask()
+        shm = shared_memory.SharedMemory(name=name)
+        _worker_mask = (name, shm, shm.buf.toreadonly())
+
+    return _worker_mask[2]
+
+
+def _detach_mask():
+    global _worker_mask
+
+    if _worker_mask is not None:
+        _, shm, view = _worker_mask
+        _worker_mask = None
+        view.release()
+        shm.close()
+
+
+def _search(blocked, rows, cols, origin, goals, reverse, return_paths):
+    """
+    Dijkstra from origin until every reachable goal is settled.
+
+    In reverse mode the origin is a target and the goals are sources: a
+    blocked origin is unreachable, and blocked goals may be stepped onto
+    (but not through), which mirrors a source leaving an inflated obstacle.
+
+    Returns:
+        tuple: (costs, paths) with one entry per goal; paths is None unless
+               return_paths, and each path runs from source to target
+    """
+    inf = float("inf")
+    origin_index = origin[0] * cols + origin[1]
+    goal_indices = [r * cols + c for r, c in goals]
+
+    if reverse and blocked[origin_index]:
+        # Only a source on the very same cell is there already
+        costs = [0.0 if i == origin_index else inf for i in goal_indices]
+        paths = [[tuple(origin)] if i == origin_index else [] for i in goal_indices]
+        return costs, (paths if return_paths else None)
+
+    # Blocked goals: entered as endpoints in reverse mode, never otherwise
+    endpoints = [i for i in goal_indices if blocked[i]] if reverse else ()
+    costs, parents, _ = dijkstra(
+        blocked, rows, cols, origin, targets=goal_indices, endpoints=endpoints
+    )
+
+    goal_costs = [costs[i] for i in goal_indices]
+    if not return_paths:
+        return goal_costs, None
+
+    paths = []
+    for index in goal_indices:
+        path = []
+        if costs[index] != inf:
+            while index != -1:
+                path.append(divmod(index, cols))
+                index = parents[index]
+            # Parents lead back to the origin: forward paths end at the goal
+            if not reverse:
+                path.reverse()
+        paths.append(path)
+
+    return goal_costs, paths
@@ -0,0 +1,194 @@
+import math
+import numpy as np
+from config.settings import OBSTACLE, OBSTACLE_INFLUENCE
+from map.occupancy_grid import grid_rows
+
+INF = float("inf")
+
+
+def distance_transform(grid, method="exact", max_distance=None):
+    """
+    Computes the distance from every cell to its nearest obstacle.
+
+    Args:
+        grid: 2D occupancy grid
+        method: "exact" for the full Euclidean transform,
+                "capped" for the bounded variant (distances above
+                max_distance are reported as inf)
+        max_distance: cap used by the "capped" method
+                      (default: OBSTACLE_INFLUENCE)
+
+    Returns:
+        distances: 2D list of floats (0.0 on obstacles, inf if no obstacle)
+    """
+    if method == "exact":
+        return euclidean_distance_transform(grid)
+    if method == "capped":
+        return capped_distance_transform(grid, max_distance)
+    raise ValueError(f"Unknown distance transform method: {method}")
+
+
+def euclidean_distance_transform(grid):
+    """
+    Exact Euclidean distance transform (Felzenszwalb & Huttenlocher).
+
+    Runs two separable passes of the 1D squared-distance transform, so the
+    cost is linear in the number of cells. Squared distances stay integers
+    until the final square root, which makes the result identical to
+    measuring each cell against every obstacle with math.dist.
+    """
+    grid = grid_rows(grid)
+    rows = len(grid)
+    cols = len(grid[0])
+
+    # Column pass: squared vertical distance to the nearest obstacle
+    column_sq = [[INF] * cols for _ in range(rows)]
+    for c in range(cols):
+        column = [0 if grid[r][c] == OBSTACLE else INF for r in range(rows)]
+        for r, value in enumerate(_squared_distance_1d(column)):
+            column_sq[r][c] = value
+
+    # Row pass: combine with horizontal offsets
+    distances = []
+    for r in range(rows):
+        row_sq = _squared_distance_1d(column_sq[r])
+        distances.append([math.sqrt(d) if d != INF else INF for d in row_sq])
+
+    return distances
+
+
+def capped_distance_transform(grid, max_distance=None):
+    """
+    Euclidean distance transform bounded by max_distance.
+
+    Only obstacles that touch a non-obstacle cell can be the nearest obstacle
+    of a free cell, so each of them stamps its (precomputed) disk of offsets
+    onto the result. Cells further than max_distance from every obstacle are
+    left at inf, which is all the repulsive potential needs to know.
+    """
+    if max_distance is None:
+        max_distance = OBSTACLE_INFLUENCE
+
+    grid = grid_rows(grid)
+    rows = len(grid)
+    cols = len(grid[0])
+
+    distances = [[INF] * cols for _ in range(rows)]
+    offsets = _disk_offsets(max_distance)
+
+    for r in range(rows):
+        for c in range(cols):
+            if grid[r][c] != OBSTACLE:
+                continue
+
+            distances[r][c] = 0.0
+            if not _is_boundary(grid, r, c, rows, cols):
+                continue
+
+            for dr, dc, d in offsets:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < rows and 0 <= nc < cols and d < distances[nr][nc]:
+                    distances[nr][nc] = d
+
+    return distances
+
+
+def capped_distance_transform_array(obstacles, max_distance=None):
+    """
+    Vectorized capped distance transform.
+
+    Args:
+        obstacles: 2D boolean array, True on obstacle cells
+        max_distance: cap on reported distances (default: OBSTACLE_INFLUENCE)
+
+    Returns:
+        distances: float ndarray (0.0 on obstacles, inf beyond max_distance)
+    """
+    if max_distance is None:
+        max_distance = OBSTACLE_INFLUENCE
+
+    obstacles = np.asarray(obstacles, dtype=bool)
+    rows, cols = obstacles.shape
+
+    distances = np.full((rows, cols), INF)
+    distances[obstacles] = 0.0
+
+    # One whole-array pass per offset in the disk: a cell gets distance d
+    # if there is an obstacle at offset (dr, dc) from it.
+    for dr, dc, d in _disk_offsets(max_distance):
+        r0, r1 = max(0, -dr), min(rows, rows - dr)
+        c0, c1 = max(0, -dc), min(cols, cols - dc)
+        if r0 >= r1 or c0 >= c1:
+            continue
+
+        source = obstacles[r0 + dr:r1 + dr, c0 + dc:c1 + dc]
+        target = distances[r0:r1, c0:c1]
+        np.copyto(target, d, where=source & (target > d))
+
+    return distances
+
+
+def _squared_distance_1d(f):
+    """
+    1D squared distance transform of the sampled function f
+    (lower envelope of parabolas rooted at the finite samples).
+    """
+    n = len(f)
+    sites = []        # locations of parabolas in the lower envelope
+    boundaries = []   # left boundary of each parabola's range
+
+    for q in range(n):
+        fq = f[q]
+        if fq == INF:
+            continue
+
+        s = -INF
+        while sites:
+            p = sites[-1]
+            s = ((fq + q * q) - (f[p] + p * p)) / (2 * (q - p))
+            if s <= boundaries[-1]:
+                sites.pop()
+                boundaries.pop()
+                s = -INF
+            else:
+                break
+
+        sites.append(q)
+        boundaries.append(s)
+
+    if not sites:
+        return [INF] * n
+
+    result = [INF] * n
+    k = 0
+    for q in range(n):
+        while k + 1 < len(sites) and boundaries[k + 1] < q:
+            k += 1
+        p = sites[k]
+        result[q] = (q - p) * (q - p) + f[p]
+
+    return result
+
+
+def _disk_offsets(radius):
+    """All (dr, dc, distance) offsets with 0 < distance <= radius."""
+    reach = int(math.floor(radius))
+    offsets = []
+    for dr in range(-reach, reach + 1):
+        for dc in range(-reach, reach + 1):
+            if dr == 0 and dc == 0:
+                continue
+            d = math.sqrt(dr * dr + dc * dc)
+            if d <= radius:
+                offsets.append((dr, dc, d))
+    return offsets
+
+
+def _is_boundary(grid, r, c, rows, cols):
+    """True if the obstacle at (r, c) has a non-obstacle 8-neighbor."""
+    for dr in (-1, 0, 1):
+        for dc in (-1, 0, 1):
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols and grid[nr][nc] != OBSTACLE:
+                return True
+    return False
@@ -0,0 +1,286 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from config.settings import (
+    OBSTACLE,
+    ATTRACTIVE_GAIN,
+    REPULSIVE_GAIN,
+    OBSTACLE_INFLUENCE,
+    FIELD_CACHE_MAX_BYTES,
+    HPA_CLUSTER_SIZE,
+    HPA_CACHE_SIZE,
+)
+from map.occupancy_grid import OccupancyGrid, cells_digest
+from planner.hierarchical import ClusterAbstraction
+from planner.potential_field import compute_potential_field
+from planner.reachability import label_components, ReachabilityIndex
+from robot.inflation_pyramid import (
+    inflation_radii,
+    row_clearance,
+    widen_clearance,
+    threshold_clearance,
+)
+
+
+class FieldCache:
+    """
+    Caches inflated grids and potential fields.
+
+    Entries are keyed by a content hash of the map plus everything the
+    result depends on: robot size for the inflated grid and its component
+    labels, the row radius for the inflation pyramid levels the inflated
+    grids are cut from, and additionally
+    the goal and potential field gains for the field. Recently used entries
+    are kept in memory up to max_bytes; with a cache_dir, entries are also
+    written as .npy files and memory-mapped back, so they survive restarts
+    and can be shared between processes.
+
+    HPA* cluster abstractions of the inflated grids are kept too (the
+    HPA_CACHE_SIZE most recently used, in memory only).
+
+    The cache may be shared between threads. Entries are built outside the
+    lock, so a cold computation never delays lookups of warm entries;
+    threads asking for an entry that is being built wait for that one build
+    instead of repeating it.
+    """
+
+    def __init__(self, max_bytes=None, cache_dir=None):
+        if max_bytes is None:
+            max_bytes = FIELD_CACHE_MAX_BYTES
+
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._abstractions = OrderedDict()
+        self._pending = {}
+        self._lock = threading.Lock()
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get_inflated_grid(self, grid, robot_width, robot_height, statistics=None):
+        """
+        Returns the inflated grid for this map and robot size (uint8 ndarray).
+        """
+        return self._inflated_grid(grid, grid_digest(grid), robot_width, robot_height, statistics)
+
+    def get_potential_field(self, grid, goal, robot_width, robot_height, statistics=None):
+        """
+        Returns the potential field (float ndarray) for this map, goal and
+        robot size. The inflated grid is only looked up on a miss.
+        """
+        digest = grid_digest(grid)
+        key = self._key(
+            "potential", digest, robot_width, robot_height,
+            int(goal[0]), int(goal[1]), ATTRACTIVE_GAIN, REPULSIVE_GAIN, OBSTACLE_INFLUENCE,
+        )
+
+        def compute():
+            inflated = self._inflated_grid(grid, digest, robot_width, robot_height, statistics)
+            return compute_potential_field(inflated, goal, backend="numpy")
+
+        return self._get_or_compute(key, compute, statistics)
+
+    def get_reachability(self, grid, robot_width, robot_height, statistics=None):
+        """
+        Returns a ReachabilityIndex for this map and robot size. The
+        component labels are cached like the inflated grid; each call gets
+        its own index, so updating one does not change the cache.
+        """
+        digest = grid_digest(grid)
+        key = self._key("components", digest, robot_width, robot_height)
+
+        def compute():
+            inflated = self._inflated_grid(grid, digest, robot_width, robot_height, statistics)
+            return label_components(inflated)
+
+        return ReachabilityIndex(self._get_or_compute(key, compute, statistics))
+
+    def get_abstraction(self, grid, robot_width, robot_height, cluster_size=None, statistics=None):
+        """
+        Returns the HPA* ClusterAbstraction of the inflated grid for this map
+        and robot size, shared by every query on it whatever the goal.
+        """
+        if cluster_size is None:
+            cluster_size = HPA_CLUSTER_SIZE
+
+        digest = grid_digest(grid)
+        key = (digest, robot_width, robot_height, cluster_size)
+
+        def lookup():
+            if key in self._abstractions:
+                self._abstractions.move_to_end(key)
+                return self._abstractions[key]
+            return None
+
+        def compute():
+            inflated = self._inflated_grid(grid, digest, robot_width, robot_height, statistics)
+            return ClusterAbstraction(np.asarray(inflated) == OBSTACLE, cluster_size)
+
+        def store(abstraction):
+            self._abstractions[key] = abstraction
+            while len(self._abstractions) > HPA_CACHE_SIZE:
+                self._abstractions.popitem(last=False)
+
+        return self._build_once(("abstraction", key), lookup, compute, store)
+
+    def clear(self):
+        """Drops all in-memory entries (files in cache_dir are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._abstractions.clear()
+            self.current_bytes = 0
+
+    def _inflated_grid(self, grid, digest, robot_width, robot_height, statistics):
+        key = self._key("inflated", digest, robot_width, robot_height)
+
+        def compute():
+            inflate_r, inflate_c = inflation_radii(robot_width, robot_height)
+            level = self._clearance_level(grid, digest, inflate_r)
+            return threshold_clearance(np.asarray(grid), level, inflate_c)
+
+        return self._get_or_compute(key, compute, statistics)
+
+    def _clearance_level(self, grid, digest, k):
+        """
+        Level k of the map's inflation pyramid (see InflationPyramid). Levels
+        are cached like any other entry, so every robot size with the same
+        row radius shares one level and a size sweep builds each level once.
+        """
+        key = self._key("clearance", digest, k)
+
+        def compute():
+            if k == 0:
+                return row_clearance(np.asarray(grid) == OBSTACLE)
+            return widen_clearance(
+                self._clearance_level(grid, digest, k - 1),
+                self._clearance_level(grid, digest, 0),
+                k,
+            )
+
+        return self._get_or_compute(key, compute, None)
+
+    def _get_or_compute(self, key, compute, statistics):
+        computed = []
+
+        def build():
+            # Disk first (outside the lock: reading or writing a large field
+            # must not stall threads that only need a warm entry)
+            value = self._load(key)
+            if value is None:
+                computed.append(True)
+                value = compute()
+                self._save(key, value)
+            return value
+
+        value = self._build_once(
+            key, lambda: self._recall(key), build, lambda value: self._remember(key, value)
+        )
+
+        with self._lock:
+            if computed:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if statistics:
+            if computed:
+                statistics.cache_misses += 1
+            else:
+                statistics.cache_hits += 1
+
+        return value
+
+    def _build_once(self, key, lookup, compute, store):
+        """
+        Returns lookup() if it finds the entry, otherwise builds it with
+        compute() and keeps it with store(value).
+
+        lookup and store run under the lock; compute runs outside it, and
+        threads that need an entry another thread is building wait for that
+        build instead of repeating it.
+        """
+        while True:
+            with self._lock:
+                value = lookup()
+                if value is not None:
+                    return value
+                building = self._pending.get(key)
+                if building is None:
+                    building = self._pending[key] = threading.Event()
+                    break
+            building.wait()
+
+        try:
+            value = compute()
+            with self._lock:
+                store(value)
+        finally:
+            with self._lock:
+                del self._pending[key]
+            building.set()
+
+        return value
+
+    def _recall(self, key):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        return None
+
+    def _load(self, key):
+        path = self._path(key)
+        if path and os.path.exists(path):
+            return np.load(path, mmap_mode="r")
+        return None
+
+    def _save(self, key, value):
+        path = self._path(key)
+        if path:
+            # Write to a private temp file first so concurrent readers never
+            # see a partially written array
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, value)
+            os.replace(tmp_path, path)
+
+    def _remember(self, key, value):
+        size = value.nbytes
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = value
+        self.current_bytes += size
+
+        # Evict least recently used entries until we fit the budget
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted.nbytes
+
+    def _path(self, key):
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{key}.npy")
+
+    @staticmethod
+    def _key(kind, *parts):
+        text = "|".join(repr(p) for p in parts)
+        return f"{kind}-{hashlib.sha256(text.encode()).hexdigest()[:32]}"
+
+
+def grid_digest(grid):
+    """
+    Content hash of an occupancy grid (shape and cell values). An
+    OccupancyGrid keeps its digest, so the map is hashed once, not on every
+    lookup.
+    """
+    if isinstance(grid, OccupancyGrid):
+        return grid.digest
+    return cells_digest(grid)
@@ -0,0 +1,311 @@
+from heapq import heappush, heappop
+
+import numpy as np
+
+from config.settings import HPA_CLUSTER_SIZE
+from planner.lazy_potential import LazyPotentialField
+from planner.path_extractor import NEIGHBORS, astar_search, move_cost, octile_distance
+
+# Entrances at least this wide get a transition at each end instead of one
+# in the middle
+LONG_ENTRANCE = 6
+
+
+class ClusterAbstraction:
+    """
+    HPA* abstraction of a blocked-cell mask.
+
+    The map is split into square clusters. Every maximal run of free cells
+    along a border between two clusters is an entrance, represented by one
+    or two transition cell pairs. Transition cells are the nodes of the
+    abstract graph: the two cells of a pair are joined by a straight move,
+    and transition cells of the same cluster are joined by their shortest
+    distance inside that cluster (computed once, here).
+
+    Move costs are those of astar_search (1.0 straight, 1.414 diagonal).
+    """
+
+    def __init__(self, blocked, cluster_size=None):
+        if cluster_size is None:
+            cluster_size = HPA_CLUSTER_SIZE
+
+        blocked = np.asarray(blocked, dtype=bool)
+        self.rows, self.cols = blocked.shape
+        self.cluster_size = cluster_size
+        self.blocked = blocked.ravel().tolist()
+
+        self.edges = {}              # node -> list of (node, cost)
+        self.cluster_nodes = {}      # (cluster row, cluster col) -> [node, ...]
+        self.nodes_explored = 0      # concrete expansions spent preprocessing
+
+        self._build_entrances()
+        self._build_intra_edges()
+
+    def cluster_of(self, index):
+        r, c = divmod(index, self.cols)
+        return (r // self.cluster_size, c // self.cluster_size)
+
+    def cluster_bounds(self, cluster):
+        """Returns (r0, r1, c0, c1) of a cluster, upper bounds exclusive."""
+        cs = self.cluster_size
+        r0, c0 = cluster[0] * cs, cluster[1] * cs
+        return (r0, min(self.rows, r0 + cs), c0, min(self.cols, c0 + cs))
+
+    def search_cluster(self, source, cluster, target=None):
+        """
+        Dijkstra from source restricted to one cluster.
+
+        Returns:
+            tuple: (costs, parents, expanded) with dicts keyed by flat index
+        """
+        return _bounded_dijkstra(
+            self.blocked, self.cols, source, self.cluster_bounds(cluster), target
+        )
+
+    def _build_entrances(self):
+        cs = self.cluster_size
+
+        # Vertical borders: between column x - 1 and column x
+        for x in range(cs, self.cols, cs):
+            for r0 in range(0, self.rows, cs):
+                pairs = [(r * self.cols + x - 1, r * self.cols + x)
+                         for r in range(r0, min(self.rows, r0 + cs))]
+                self._add_entrances(pairs)
+
+        # Horizontal borders: between row y - 1 and row y
+        for y in range(cs, self.rows, cs):
+            for c0 in range(0, self.cols, cs):
+                pairs = [((y - 1) * self.cols + c, y * self.cols + c)
+                         for c in range(c0, min(self.cols, c0 + cs))]
+                self._add_entrances(pairs)
+
+    def _add_entrances(self, pairs):
+        """Turns runs of crossable cell pairs along one border into transitions."""
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and not self.blocked[pair[0]] and not self.blocked[pair[1]]:
+                run.append(pair)
+                continue
+
+            if run:
+                if len(run) >= LONG_ENTRANCE:
+                    chosen = [run[0], run[-1]]
+                else:
+                    chosen = [run[len(run) // 2]]
+
+                for a, b in chosen:
+                    self._add_node(a)
+                    self._add_node(b)
+                    self.edges[a].append((b, 1.0))
+                    self.edges[b].append((a, 1.0))
+                run = []
+
+    def _build_intra_edges(self):
+        for cluster, nodes in self.cluster_nodes.items():
+            for node in nodes:
+                costs, _, expanded = self.search_cluster(node, cluster)
+                self.nodes_explored += expanded
+                for other in nodes:
+                    if other != node and other in costs:
+                        self.edges[node].append((other, costs[other]))
+
+    def _add_node(self, index):
+        if index not in self.edges:
+            self.edges[index] = []
+            self.cluster_nodes.setdefault(self.cluster_of(index), []).append(index)
+
+
+def hierarchical_search(potential, start, goal, statistics=None, cluster_size=None,
+                        abstraction=None):
+    """
+    HPA* search on the cells the potential field marks as free.
+
+    Start and goal are connected to the transition cells of their clusters,
+    the abstract graph is searched with A*, and each abstract edge is then
+    refined into grid cells by a search confined to one cluster. If the
+    abstract graph has no route (e.g. the only connection is a diagonal step
+    across a cluster corner), the query falls back to astar_search.
+
+    Args:
+        potential: 2D potential field (inf marks obstacles)
+        start: (row, col) starting position
+        goal: (row, col) goal position
+        statistics: PlanningStatistics object (optional); receives the
+                    abstract node count
+        cluster_size: cluster edge in cells (default: HPA_CLUSTER_SIZE)
+        abstraction: ClusterAbstraction of the cells the field marks as free,
+                     e.g. from FieldCache.get_abstraction (optional; built
+                     from the field for this query if not given, which costs
+                     more than the search itself)
+
+    Returns:
+        tuple: (path, nodes_explored) where nodes_explored counts concrete
+               grid expansions
+    """
+    if abstraction is None:
+        abstraction = ClusterAbstraction(_blocked_mask(potential), cluster_size)
+    cols = abstraction.cols
+
+    start_index = start[0] * cols + start[1]
+    goal_index = goal[0] * cols + goal[1]
+
+    if start_index == goal_index:
+        return [start], 1
+
+    if abstraction.blocked[goal_index]:
+        return [], 0
+
+    start_cluster = abstraction.cluster_of(start_index)
+    goal_cluster = abstraction.cluster_of(goal_index)
+    nodes_explored = 0
+
+    # Connect start and goal to the transition cells of their clusters
+    start_costs, _, expanded = abstraction.search_cluster(start_index, start_cluster)
+    nodes_explored += expanded
+    goal_costs, _, expanded = abstraction.search_cluster(goal_index, goal_cluster)
+    nodes_explored += expanded
+
+    start_edges = [(n, start_costs[n]) for n in abstraction.cluster_nodes.get(start_cluster, [])
+                   if n in start_costs]
+    goal_edges = {n: goal_costs[n] for n in abstraction.cluster_nodes.get(goal_cluster, [])
+                  if n in goal_costs}
+    if start_cluster == goal_cluster and goal_index in start_costs:
+        start_edges.append((goal_index, start_costs[goal_index]))
+
+    route, abstract_explored = _abstract_search(
+        abstraction, start_index, goal_index, start_edges, goal_edges
+    )
+
+    if statistics:
+        statistics.abstract_nodes_explored += abstract_explored
+
+    if not route:
+        path, expanded = astar_search(potential, start, goal, statistics=statistics)
+        return path, nodes_explored + expanded
+
+    path, expanded = _refine(abstraction, route)
+    return path, nodes_explored + expanded
+
+
+def _blocked_mask(potential):
+    """
+    Cells a field marks as blocked (inf). A lazy field answers from its
+    obstacle mask instead of computing every potential.
+    """
+    if isinstance(potential, LazyPotentialField):
+        return potential.obstacles
+    return np.isinf(np.asarray(potential, dtype=float))
+
+
+def _abstract_search(abstraction, start, goal, start_edges, goal_edges):
+    """A* over the abstract graph plus the temporary start/goal edges."""
+    cols = abstraction.cols
+    goal_rc = divmod(goal, cols)
+
+    def heuristic(index):
+        r, c = divmod(index, cols)
+        return octile_distance(r - goal_rc[0], c - goal_rc[1])
+
+    g_scores = {start: 0.0}
+    parents = {start: None}
+    open_set = [(heuristic(start), 0.0, start)]
+    explored = 0
+
+    while open_set:
+        _, g, node = heappop(open_set)
+        if g > g_scores[node]:
+            continue
+
+        explored += 1
+        if node == goal:
+            route = []
+            while node is not None:
+                route.append(node)
+                node = parents[node]
+            route.reverse()
+            return route, explored
+
+        edges = abstraction.edges.get(node, [])
+        if node == start:
+            edges = start_edges + edges
+        if node in goal_edges:
+            edges = list(edges) + [(goal, goal_edges[node])]
+
+        for neighbor, cost in edges:
+            tentative = g + cost
+            if tentative < g_scores.get(neighbor, float("inf")):
+                g_scores[neighbor] = tentative
+                parents[neighbor] = node
+                heappush(open_set, (tentative + heuristic(neighbor), tentative, neighbor))
+
+    return [], explored
+
+
+def _refine(abstraction, route):
+    """Expands an abstract route into grid cells."""
+    cols = abstraction.cols
+    path = [divmod(route[0], cols)]
+    expanded = 0
+
+    for a, b in zip(route, route[1:]):
+        ra, ca = divmod(a, cols)
+        rb, cb = divmod(b, cols)
+
+        # Transition across a border: a single move
+        if max(abs(ra - rb), abs(ca - cb)) == 1 and abstraction.cluster_of(a) != abstraction.cluster_of(b):
+            path.append((rb, cb))
+            continue
+
+        _, parents, n = abstraction.search_cluster(a, abstraction.cluster_of(a), target=b)
+        expanded += n
+
+        segment = []
+        node = b
+        while node != a:
+            segment.append(divmod(node, cols))
+            node = parents[node]
+        segment.reverse()
+        path.extend(segment)
+
+    return path, expanded
+
+
+def _bounded_dijkstra(blocked, cols, source, bounds, target=None):
+    """
+    Dijkstra from source over the free cells inside bounds.
+
+    The source itself may be blocked (a robot can always step out of its own
+    cell, as in astar_search). Stops early once target is settled.
+    """
+    r0, r1, c0, c1 = bounds
+    costs = {source: 0.0}
+    parents = {source: None}
+    open_set = [(0.0, source)]
+    expanded = 0
+
+    while open_set:
+        cost, current = heappop(open_set)
+        if cost > costs[current]:
+            continue
+
+        expanded += 1
+        if current == target:
+            break
+
+        r, c = divmod(current, cols)
+        for dr, dc in NEIGHBORS:
+            nr, nc = r + dr, c + dc
+            if not (r0 <= nr < r1 and c0 <= nc < c1):
+                continue
+
+            neighbor = nr * cols + nc
+            if blocked[neighbor]:
+                continue
+
+            new_cost = cost + move_cost(dr, dc)
+            if new_cost < costs.get(neighbor, float("inf")):
+                costs[neighbor] = new_cost
+                parents[neighbor] = current
+                heappush(open_set, (new_cost, neighbor))
+
+    return costs, parents, expanded
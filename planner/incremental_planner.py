@@ -0,0 +1,301 @@
+import math
+from heapq import heappush, heappop
+
+import numpy as np
+
+from config.settings import (
+    OBSTACLE,
+    OBSTACLE_INFLUENCE,
+    ROBOT_WIDTH,
+    ROBOT_HEIGHT,
+)
+from planner.path_extractor import flat_moves, octile_distance
+from planner.potential_field import compute_potential_field_array
+from robot.shape_handler import inflate_obstacles
+
+# Keys sum the same costs in different orders along different routes, so
+# equal keys can differ in the last bits; closer than this counts as equal
+KEY_TOLERANCE = 1e-9
+
+
+class IncrementalPlanner:
+    """
+    Replans toward a fixed goal while cells of the map change (D* Lite).
+
+    The planner keeps the raw grid, the inflated grid, the potential field
+    and the D* Lite search state between calls. update_cells() re-inflates
+    only the neighbourhood of the changed cells, refreshes the potential
+    within OBSTACLE_INFLUENCE of cells whose blocked status changed, and
+    marks the affected vertices inconsistent; replan() then repairs the
+    existing search instead of starting over.
+
+    Move costs match astar_search (1.0 straight, 1.414 diagonal) and cells
+    that are obstacles in the inflated grid cannot be entered. Among equally
+    short routes, the path prefers cells with lower potential.
+    """
+
+    def __init__(self, grid, goal, robot_width=None, robot_height=None):
+        if robot_width is None:
+            robot_width = ROBOT_WIDTH
+        if robot_height is None:
+            robot_height = ROBOT_HEIGHT
+
+        self.robot_width = robot_width
+        self.robot_height = robot_height
+        self.goal = tuple(goal)
+
+        self.grid = np.array(grid, dtype=np.uint8)
+        self.rows, self.cols = self.grid.shape
+        self.inflated_grid = np.asarray(
+            inflate_obstacles(self.grid.tolist(), robot_width, robot_height), dtype=np.uint8
+        )
+        self.potential = compute_potential_field_array(self.inflated_grid, self.goal)
+
+        n = self.rows * self.cols
+        inf = float("inf")
+        self._blocked = (self.inflated_grid == OBSTACLE).ravel().tolist()
+        self._g = [inf] * n
+        self._rhs = [inf] * n
+        self._open = []         # heap of (k1, k2, index), stale entries skipped
+        self._open_keys = {}    # index -> key of its live heap entry
+        self._km = 0.0
+        self._position = None
+
+        self._moves = flat_moves(self.cols)
+
+        goal_index = self._index(self.goal)
+        self._rhs[goal_index] = 0.0
+        self._push(goal_index)
+
+    def update_cells(self, changes):
+        """
+        Applies changes to the raw occupancy grid.
+
+        Args:
+            changes: iterable of ((row, col), value) pairs, e.g. OBSTACLE or FREE
+
+        Returns:
+            number of cells whose inflated (blocked) status changed
+
+        Raises:
+            ValueError: if a cell is outside the map (nothing is applied)
+        """
+        changes = list(changes)
+        for (r, c), _ in changes:
+            if not (0 <= r < self.rows and 0 <= c < self.cols):
+                raise ValueError(f"Cell {[r, c]} is outside the {self.rows} x {self.cols} map.")
+
+        inflate_r = (self.robot_height - 1) // 2
+        inflate_c = (self.robot_width - 1) // 2
+        reach = int(math.ceil(OBSTACLE_INFLUENCE))
+        changed_cells = 0
+
+        for (r, c), value in changes:
+            if self.grid[r, c] == value:
+                continue
+            self.grid[r, c] = value
+
+            # Inflated cells that can see (r, c) through the robot footprint
+            r0, r1 = max(0, r - inflate_r), min(self.rows, r + inflate_r + 1)
+            c0, c1 = max(0, c - inflate_c), min(self.cols, c + inflate_c + 1)
+            changed = self._refresh_inflation(r0, r1, c0, c1, inflate_r, inflate_c)
+            if not changed:
+                continue
+
+            changed_cells += len(changed)
+            self._refresh_potential(
+                max(0, r0 - reach), min(self.rows, r1 + reach),
+                max(0, c0 - reach), min(self.cols, c1 + reach),
+            )
+
+            # Edges into a changed cell changed cost: its neighbours (the
+            # vertices using those edges) may now be inconsistent
+            for index in changed:
+                self._blocked[index] = not self._blocked[index]
+                cr, cc = divmod(index, self.cols)
+                for dr, dc, offset, _ in self._moves:
+                    if 0 <= cr + dr < self.rows and 0 <= cc + dc < self.cols:
+                        self._update_vertex(index + offset)
+
+        return changed_cells
+
+    def replan(self, current_position, statistics=None):
+        """
+        Repairs the search for the robot's current position.
+
+        Args:
+            current_position: (row, col) of the robot
+            statistics: PlanningStatistics object (optional)
+
+        Returns:
+            path: list of (row, col) tuples from current_position to the goal,
+                  or [] if the goal is unreachable
+        """
+        current_position = tuple(current_position)
+
+        # Moving the start lowers every heuristic by at most this much;
+        # adding it to km keeps queued keys valid lower bounds
+        if self._position is not None:
+            self._km += self._heuristic(self._position, current_position)
+        self._position = current_position
+
+        nodes_explored = self._compute_shortest_path()
+        if statistics:
+            statistics.nodes_explored += nodes_explored
+
+        return self._extract_path()
+
+    def _compute_shortest_path(self):
+        start = self._index(self._position)
+        g, rhs = self._g, self._rhs
+        nodes_explored = 0
+
+        while self._open:
+            k1, k2, u = self._open[0]
+            if self._open_keys.get(u) != (k1, k2):
+                heappop(self._open)
+                continue
+
+            if not _key_less((k1, k2), self._key(start)) and rhs[start] == g[start]:
+                break
+
+            heappop(self._open)
+            del self._open_keys[u]
+            nodes_explored += 1
+
+            new_key = self._key(u)
+            if _key_less((k1, k2), new_key):
+                self._push(u, new_key)
+            elif g[u] > rhs[u]:
+                g[u] = rhs[u]
+                self._update_neighbors(u)
+            else:
+                g[u] = float("inf")
+                self._update_vertex(u)
+                self._update_neighbors(u)
+
+        return nodes_explored
+
+    def _extract_path(self):
+        inf = float("inf")
+        start = self._index(self._position)
+        goal = self._index(self.goal)
+
+        if self._rhs[start] == inf:
+            return []
+
+        path = [self._position]
+        current = start
+        limit = self.rows * self.cols
+
+        while current != goal and len(path) <= limit:
+            r, c = divmod(current, self.cols)
+            best, best_value = -1, (inf, inf)
+
+            for dr, dc, offset, move_cost in self._moves:
+                if not (0 <= r + dr < self.rows and 0 <= c + dc < self.cols):
+                    continue
+                neighbor = current + offset
+                if self._blocked[neighbor]:
+                    continue
+
+                value = (move_cost + self._g[neighbor], self.potential.flat[neighbor])
+                if value < best_value:
+                    best, best_value = neighbor, value
+
+            if best == -1 or best_value[0] == inf:
+                return []
+
+            current = best
+            path.append(divmod(current, self.cols))
+
+        return path if current == goal else []
+
+    def _refresh_inflation(self, r0, r1, c0, c1, inflate_r, inflate_c):
+        """
+        Re-inflates the window [r0, r1) x [c0, c1) from the raw grid.
+
+        Returns:
+            flat indices of cells whose blocked status changed
+        """
+        # Obstacles up to one footprint outside the window can reach into it
+        pr0, pr1 = max(0, r0 - inflate_r), min(self.rows, r1 + inflate_r)
+        pc0, pc1 = max(0, c0 - inflate_c), min(self.cols, c1 + inflate_c)
+
+        window = self.grid[pr0:pr1, pc0:pc1].tolist()
+        inflated = np.asarray(
+            inflate_obstacles(window, self.robot_width, self.robot_height), dtype=np.uint8
+        )[r0 - pr0:r1 - pr0, c0 - pc0:c1 - pc0]
+
+        old_blocked = self.inflated_grid[r0:r1, c0:c1] == OBSTACLE
+        self.inflated_grid[r0:r1, c0:c1] = inflated
+
+        flipped_r, flipped_c = np.nonzero(old_blocked != (inflated == OBSTACLE))
+        return [(r0 + r) * self.cols + (c0 + c) for r, c in zip(flipped_r.tolist(), flipped_c.tolist())]
+
+    def _refresh_potential(self, r0, r1, c0, c1):
+        """Recomputes the potential field on the window [r0, r1) x [c0, c1)."""
+        reach = int(math.ceil(OBSTACLE_INFLUENCE))
+        pr0, pr1 = max(0, r0 - reach), min(self.rows, r1 + reach)
+        pc0, pc1 = max(0, c0 - reach), min(self.cols, c1 + reach)
+
+        # The attractive term only depends on the offset to the goal, so the
+        # window can be evaluated on its own with a shifted goal
+        local_goal = (self.goal[0] - pr0, self.goal[1] - pc0)
+        window = compute_potential_field_array(self.inflated_grid[pr0:pr1, pc0:pc1], local_goal)
+        self.potential[r0:r1, c0:c1] = window[r0 - pr0:r1 - pr0, c0 - pc0:c1 - pc0]
+
+    def _update_vertex(self, u):
+        if u != self._index(self.goal):
+            r, c = divmod(u, self.cols)
+            best = float("inf")
+            for dr, dc, offset, move_cost in self._moves:
+                if not (0 <= r + dr < self.rows and 0 <= c + dc < self.cols):
+                    continue
+                neighbor = u + offset
+                if self._blocked[neighbor]:
+                    continue
+                cost = move_cost + self._g[neighbor]
+                if cost < best:
+                    best = cost
+            self._rhs[u] = best
+
+        self._open_keys.pop(u, None)
+        if self._g[u] != self._rhs[u]:
+            self._push(u)
+
+    def _update_neighbors(self, u):
+        """Updates the vertices that can move into u."""
+        r, c = divmod(u, self.cols)
+        for dr, dc, offset, _ in self._moves:
+            if 0 <= r + dr < self.rows and 0 <= c + dc < self.cols:
+                self._update_vertex(u + offset)
+
+    def _push(self, u, key=None):
+        if key is None:
+            key = self._key(u)
+        self._open_keys[u] = key
+        heappush(self._open, (key[0], key[1], u))
+
+    def _key(self, u):
+        best = min(self._g[u], self._rhs[u])
+        if self._position is None:
+            h = 0.0
+        else:
+            h = self._heuristic(divmod(u, self.cols), self._position)
+        return (best + h + self._km, best)
+
+    def _index(self, position):
+        return position[0] * self.cols + position[1]
+
+    @staticmethod
+    def _heuristic(a, b):
+        """Octile distance: consistent with the straight/diagonal move costs."""
+        return octile_distance(a[0] - b[0], a[1] - b[1])
+
+
+def _key_less(a, b):
+    """Lexicographic a < b on (k1, k2) keys, with KEY_TOLERANCE on both parts."""
+    if abs(a[0] - b[0]) > KEY_TOLERANCE:
+        return a[0] < b[0]
+    return a[1] < b[1] - KEY_TOLERANCE
@@ -0,0 +1,158 @@
+from heapq import heappush, heappop
+
+from planner.path_extractor import octile_distance, _field_shape, _flat_values
+
+
+def jps_search(potential, start, goal, use_potential=False):
+    """
+    Jump Point Search on the cells the potential field marks as free.
+
+    Uses the same moves and costs as astar_search (8-connected, 1.0
+    straight, 1.414 diagonal, diagonal steps allowed past corners), which is
+    the uniform-cost setting where symmetric paths can be pruned: only jump
+    points (cells with forced neighbours, or the goal) enter the open list.
+
+    Args:
+        potential: 2D potential field (inf marks obstacles)
+        start: (row, col) starting position
+        goal: (row, col) goal position
+        use_potential: rank the open list by g + potential, like astar_search,
+                       instead of g + octile distance. The potential steers
+                       the search as a heuristic rather than being added to
+                       the move costs: a per-cell cost would break the
+                       symmetry that jump pruning relies on, since a jump
+                       skips the cells between jump points. The path stays
+                       valid but is no longer guaranteed to be shortest.
+
+    Cells are read through the same flat view as astar_search, on first
+    touch, so setup does not grow with the map and lazy fields only compute
+    the cells the jumps scan.
+
+    Returns:
+        tuple: (path, nodes_explored) with the full cell-by-cell path
+    """
+    rows, cols = _field_shape(potential)
+    values = _flat_values(potential)
+    inf = float("inf")
+
+    start = tuple(start)
+    goal = tuple(goal)
+
+    if start == goal:
+        return [start], 1
+
+    def is_free(r, c):
+        return 0 <= r < rows and 0 <= c < cols and values[r * cols + c] != inf
+
+    def heuristic(r, c):
+        if use_potential:
+            return values[r * cols + c]
+        return octile_distance(r - goal[0], c - goal[1])
+
+    def jump_straight(r, c, dr, dc):
+        while True:
+            r, c = r + dr, c + dc
+            if not is_free(r, c):
+                return None
+            if (r, c) == goal:
+                return (r, c)
+            if dr:
+                if (not is_free(r, c + 1) and is_free(r + dr, c + 1)) or \
+                   (not is_free(r, c - 1) and is_free(r + dr, c - 1)):
+                    return (r, c)
+            else:
+                if (not is_free(r + 1, c) and is_free(r + 1, c + dc)) or \
+                   (not is_free(r - 1, c) and is_free(r - 1, c + dc)):
+                    return (r, c)
+
+    def jump(r, c, dr, dc):
+        if not (dr and dc):
+            return jump_straight(r, c, dr, dc)
+
+        while True:
+            r, c = r + dr, c + dc
+            if not is_free(r, c):
+                return None
+            if (r, c) == goal:
+                return (r, c)
+            if (not is_free(r - dr, c) and is_free(r - dr, c + dc)) or \
+               (not is_free(r, c - dc) and is_free(r + dr, c - dc)):
+                return (r, c)
+            if jump_straight(r, c, dr, 0) or jump_straight(r, c, 0, dc):
+                return (r, c)
+
+    def directions(node, parent):
+        r, c = node
+        if parent is None:
+            return [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+
+        dr = (r > parent[0]) - (r < parent[0])
+        dc = (c > parent[1]) - (c < parent[1])
+
+        if dr and dc:
+            dirs = [(dr, dc), (dr, 0), (0, dc)]
+            if not is_free(r - dr, c):
+                dirs.append((-dr, dc))
+            if not is_free(r, c - dc):
+                dirs.append((dr, -dc))
+        elif dr:
+            dirs = [(dr, 0)]
+            if not is_free(r, c + 1):
+                dirs.append((dr, 1))
+            if not is_free(r, c - 1):
+                dirs.append((dr, -1))
+        else:
+            dirs = [(0, dc)]
+            if not is_free(r + 1, c):
+                dirs.append((1, dc))
+            if not is_free(r - 1, c):
+                dirs.append((-1, dc))
+        return dirs
+
+    g_scores = {start: 0.0}
+    parents = {start: None}
+    open_set = [(heuristic(*start), 0.0, start)]
+    nodes_explored = 0
+
+    while open_set:
+        _, g, node = heappop(open_set)
+        if g > g_scores[node]:
+            continue
+
+        nodes_explored += 1
+        if node == goal:
+            return _expand_jump_points(parents, goal), nodes_explored
+
+        for dr, dc in directions(node, parents[node]):
+            jump_point = jump(node[0], node[1], dr, dc)
+            if jump_point is None:
+                continue
+
+            tentative = g + octile_distance(jump_point[0] - node[0], jump_point[1] - node[1])
+
+            if tentative < g_scores.get(jump_point, float("inf")):
+                g_scores[jump_point] = tentative
+                parents[jump_point] = node
+                heappush(open_set, (tentative + heuristic(*jump_point), tentative, jump_point))
+
+    return [], nodes_explored
+
+
+def _expand_jump_points(parents, goal):
+    """Rebuilds the cell-by-cell path between consecutive jump points."""
+    jump_points = []
+    node = goal
+    while node is not None:
+        jump_points.append(node)
+        node = parents[node]
+    jump_points.reverse()
+
+    path = [jump_points[0]]
+    for (r0, c0), (r1, c1) in zip(jump_points, jump_points[1:]):
+        r, c = r0, c0
+        while (r, c) != (r1, c1):
+            r += (r1 > r) - (r1 < r)
+            c += (c1 > c) - (c1 < c)
+            path.append((r, c))
+
+    return path
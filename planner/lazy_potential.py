@@ -0,0 +1,183 @@
+import math
+
+import numpy as np
+from config.settings import (
+    ATTRACTIVE_GAIN,
+    REPULSIVE_GAIN,
+    OBSTACLE_INFLUENCE,
+    OBSTACLE,
+)
+
+
+class ObstacleBuckets:
+    """
+    Bucket grid over the obstacle cells of a map.
+
+    Obstacles are sorted into square buckets whose edge is the obstacle
+    influence radius, so every obstacle that can repel a cell lies in the
+    3x3 block of buckets around it. Bucket contents are stored as one sorted
+    coordinate array plus per-bucket offsets (built with whole-array
+    operations); the obstacles around a bucket are gathered into a Python
+    list the first time a cell of that bucket is queried.
+    """
+
+    def __init__(self, obstacles, bucket_size):
+        self.bucket_size = bucket_size
+        rows, cols = obstacles.shape
+        self.bucket_rows = -(-rows // bucket_size)
+        self.bucket_cols = -(-cols // bucket_size)
+
+        coords = np.argwhere(obstacles)
+        ids = (coords[:, 0] // bucket_size) * self.bucket_cols + coords[:, 1] // bucket_size
+        order = np.argsort(ids, kind="stable")
+
+        self._coords = coords[order]
+        self._offsets = np.searchsorted(
+            ids[order], np.arange(self.bucket_rows * self.bucket_cols + 1)
+        )
+        self._around = {}
+
+    def bucket(self, br, bc):
+        """Returns the obstacle cells of one bucket as a list of (row, col)."""
+        key = br * self.bucket_cols + bc
+        lo, hi = self._offsets[key], self._offsets[key + 1]
+        return [tuple(rc) for rc in self._coords[lo:hi].tolist()]
+
+    def around(self, br, bc):
+        """Obstacle cells in bucket (br, bc) and the 8 buckets around it."""
+        key = br * self.bucket_cols + bc
+        cells = self._around.get(key)
+        if cells is None:
+            cells = []
+            for nbr in range(max(0, br - 1), min(self.bucket_rows, br + 2)):
+                for nbc in range(max(0, bc - 1), min(self.bucket_cols, bc + 2)):
+                    cells.extend(self.bucket(nbr, nbc))
+            self._around[key] = cells
+        return cells
+
+    def nearest_within(self, r, c):
+        """
+        Distance from (r, c) to the nearest obstacle, if it is within one
+        bucket edge.
+
+        Returns:
+            float distance, or inf if no obstacle is that close
+        """
+        size = self.bucket_size
+        best = size * size
+        found = False
+
+        for orow, ocol in self.around(r // size, c // size):
+            d2 = (orow - r) ** 2 + (ocol - c) ** 2
+            if d2 <= best:
+                best = d2
+                found = True
+
+        return math.sqrt(best) if found else float("inf")
+
+
+class LazyPotentialField:
+    """
+    Potential field evaluated on demand.
+
+    Has the indexing interface of the nested-list field (field[r][c],
+    len(field), len(field[0])) and also accepts field[r, c]. A cell's value
+    is computed the first time it is read and memoized, so a search that
+    touches a small corridor of a large map only pays for that corridor.
+    Nearest-obstacle distances come from an ObstacleBuckets index; values
+    match compute_potential_field_array.
+
+    np.asarray(field) materializes the whole field, for callers that need
+    an array.
+    """
+
+    def __init__(self, grid, goal):
+        """
+        Args:
+            grid: 2D occupancy grid (usually already inflated)
+            goal: (row, col) goal position
+        """
+        self.cells = np.asarray(grid)
+        self.rows, self.cols = self.cells.shape
+        self.shape = (self.rows, self.cols)
+        self.goal = tuple(goal)
+
+        self.obstacles = self.cells == OBSTACLE
+        self.index = ObstacleBuckets(self.obstacles, max(1, int(math.ceil(OBSTACLE_INFLUENCE))))
+
+        # Memoized values by flat index; missing cells are computed on lookup
+        self.flat = _FlatView(self)
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple):
+            r, c = key
+            return self.value(r * self.cols + c)
+        return _LazyRow(self, key)
+
+    def __array__(self, dtype=None, copy=None):
+        from planner.potential_field import compute_potential_field_array
+        field = compute_potential_field_array(self.cells, self.goal)
+        return field if dtype is None else field.astype(dtype)
+
+    @property
+    def evaluated_cells(self):
+        """Number of cells computed so far."""
+        return len(self.flat)
+
+    def value(self, index):
+        """Potential of the cell at flat index (row * cols + col)."""
+        return self.flat[index]
+
+    def _compute(self, r, c):
+        if self.obstacles[r, c]:
+            return float("inf")
+
+        # Attractive Potential (pull toward goal)
+        U_att = ATTRACTIVE_GAIN * math.sqrt((r - self.goal[0]) ** 2 + (c - self.goal[1]) ** 2)
+
+        # Repulsive Potential: only obstacles within OBSTACLE_INFLUENCE matter
+        min_dist_obs = self.index.nearest_within(r, c)
+        if min_dist_obs <= OBSTACLE_INFLUENCE:
+            U_rep = REPULSIVE_GAIN * (1.0 / min_dist_obs - 1.0 / OBSTACLE_INFLUENCE) ** 2
+        else:
+            U_rep = 0
+
+        return U_att + U_rep
+
+
+class _LazyRow:
+    """One row of a LazyPotentialField, so that field[r][c] works."""
+
+    __slots__ = ("field", "offset")
+
+    def __init__(self, field, r):
+        self.field = field
+        self.offset = r * field.cols
+
+    def __len__(self):
+        return self.field.cols
+
+    def __getitem__(self, c):
+        return self.field.value(self.offset + c)
+
+
+class _FlatView(dict):
+    """
+    Flat-index access (row * cols + col) used by astar_search.
+
+    A dict of computed values: repeated reads are plain dict lookups and
+    only a miss calls back into the field.
+    """
+
+    def __init__(self, field):
+        super().__init__()
+        self.field = field
+
+    def __missing__(self, index):
+        field = self.field
+        v = field._compute(*divmod(index, field.cols))
+        self[index] = v
+        return v
@@ -0,0 +1,153 @@
+import numpy as np
+from config.settings import OBSTACLE
+
+
+def compress_path(path, inflated_grid):
+    """
+    Reduces a cell-by-cell path to the waypoints where it changes direction
+    around obstacles (any-angle string pulling).
+
+    From each waypoint the path is followed as far as there is a clear
+    straight line to it on the inflated grid, and the cells in between are
+    dropped. Lines are checked with a supercover traversal (every cell the
+    segment touches, including both cells where it passes exactly through a
+    corner), so the straight segments never clip an obstacle. Consecutive
+    cells of the original path are always kept connectable, which means the
+    result never loses the path. Finally, waypoints lying on the straight
+    line between their neighbours are dropped, since the robot follows the
+    same line either way (this also merges diagonal runs that squeeze past
+    corners, which the supercover check rejects).
+
+    The furthest visible cell is found by doubling the look-ahead and then
+    bisecting, so long open stretches cost O(log n) line checks.
+
+    Args:
+        path: list of (row, col) tuples as returned by extract_path
+        inflated_grid: occupancy grid with obstacles inflated for the robot
+
+    Returns:
+        waypoints: list of (row, col) tuples, starting and ending like path
+    """
+    if len(path) <= 2:
+        return list(path)
+
+    cells = np.asarray(inflated_grid)
+    cols = cells.shape[1]
+    blocked = (cells == OBSTACLE).ravel().tolist()
+
+    def visible(i, j):
+        return line_of_sight(blocked, cols, path[i], path[j])
+
+    last = len(path) - 1
+    waypoints = [path[0]]
+    anchor = 0
+
+    while anchor < last:
+        # Gallop: double the step while the target stays visible
+        good = anchor + 1
+        step = 2
+        while good < last:
+            probe = min(anchor + step, last)
+            if not visible(anchor, probe):
+                bad = probe
+                break
+            good = probe
+            step *= 2
+        else:
+            bad = None
+
+        # Bisect between the last visible and first hidden probe
+        if bad is not None:
+            while bad - good > 1:
+                mid = (good + bad) // 2
+                if visible(anchor, mid):
+                    good = mid
+                else:
+                    bad = mid
+
+        waypoints.append(path[good])
+        anchor = good
+
+    return _drop_collinear(waypoints)
+
+
+def _drop_collinear(waypoints):
+    """Removes waypoints that lie on the segment between their neighbours."""
+    result = [waypoints[0]]
+    for point, following in zip(waypoints[1:], waypoints[2:]):
+        (r0, c0), (r1, c1), (r2, c2) = result[-1], point, following
+        cross = (r1 - r0) * (c2 - c1) - (c1 - c0) * (r2 - r1)
+        same_way = (r1 - r0) * (r2 - r1) + (c1 - c0) * (c2 - c1) > 0
+        if not (cross == 0 and same_way):
+            result.append(point)
+    result.append(waypoints[-1])
+    return result
+
+
+def line_of_sight(blocked, cols, a, b):
+    """
+    True if the straight segment from cell a to cell b crosses no blocked
+    cell (a itself is not checked: the robot may start inside an inflated
+    obstacle, as in astar_search).
+
+    Walks the supercover of the segment between the cell centers with
+    integer error terms (Bresenham-style).
+
+    Args:
+        blocked: flat list of booleans (row-major)
+        cols: grid width
+        a, b: (row, col) endpoints
+    """
+    r, c = a
+    r1, c1 = b
+    dr, dc = abs(r1 - r), abs(c1 - c)
+    step_r = 1 if r1 >= r else -1
+    step_c = 1 if c1 >= c else -1
+
+    if dc >= dr:
+        # Mostly horizontal: one column per step
+        ddr, ddc = 2 * dr, 2 * dc
+        error = previous = dc
+        for _ in range(dc):
+            c += step_c
+            error += ddr
+            if error > ddc:
+                r += step_r
+                error -= ddc
+                # The segment also touches a cell of the previous row/column
+                if error + previous < ddc:
+                    if blocked[(r - step_r) * cols + c]:
+                        return False
+                elif error + previous > ddc:
+                    if blocked[r * cols + c - step_c]:
+                        return False
+                else:
+                    if blocked[(r - step_r) * cols + c] or blocked[r * cols + c - step_c]:
+                        return False
+            if blocked[r * cols + c]:
+                return False
+            previous = error
+    else:
+        # Mostly vertical: one row per step
+        ddr, ddc = 2 * dr, 2 * dc
+        error = previous = dr
+        for _ in range(dr):
+            r += step_r
+            error += ddc
+            if error > ddr:
+                c += step_c
+                error -= ddr
+                if error + previous < ddr:
+                    if blocked[r * cols + c - step_c]:
+                        return False
+                elif error + previous > ddr:
+                    if blocked[(r - step_r) * cols + c]:
+                        return False
+                else:
+                    if blocked[r * cols + c - step_c] or blocked[(r - step_r) * cols + c]:
+                        return False
+            if blocked[r * cols + c]:
+                return False
+            previous = error
+
+    return True
@@ -1,6 +1,11 @@
 import math
 from collections import deque
 
+import numpy as np
+
+from planner.lazy_potential import LazyPotentialField
+from planner.statistics import FAILURE_SEARCH_EXHAUSTED, FAILURE_DEADLINE
+
 # 8 possible moves (up, down, left, right, and diagonals)
 NEIGHBORS = [
     (-1, 0),   # up
@@ -13,22 +18,89 @@ NEIGHBORS = [
     (1, 1),    # down-right
 ]
 
-def extract_path(potential, start, goal, statistics=None):
+# Move costs shared by every planner
+STRAIGHT_COST = 1.0
+DIAGONAL_COST = 1.414
+
+
+def move_cost(dr, dc):
+    """Cost of one step by (dr, dc)."""
+    return DIAGONAL_COST if (dr != 0 and dc != 0) else STRAIGHT_COST
+
+
+def flat_moves(cols):
+    """
+    Neighbor moves for flat indices (row * cols + col) on a grid with cols
+    columns, in NEIGHBORS order: (dr, dc, flat offset, move cost).
+    """
+    return [(dr, dc, dr * cols + dc, move_cost(dr, dc)) for dr, dc in NEIGHBORS]
+
+
+def octile_distance(dr, dc):
+    """
+    Cheapest cost of moving dr rows and dc columns on an empty grid (octile
+    distance); a consistent heuristic for these move costs.
+    """
+    dr, dc = abs(dr), abs(dc)
+    return DIAGONAL_COST * min(dr, dc) + STRAIGHT_COST * abs(dr - dc)
+
+def extract_path(potential, start, goal, statistics=None, method="astar", deadline_ms=None,
+                 reachability=None, abstraction=None, use_potential=False):
     """
     Uses A* search guided by the potential field to find a path.
     Falls back to simple gradient descent if A* fails.
 
     Args:
-        potential: 2D potential field
+        potential: 2D potential field (nested lists or ndarray)
         start: (row, col) starting position
         goal: (row, col) goal position
         statistics: PlanningStatistics object (optional)
+        method: "astar" (default), "hpa" for hierarchical search on the
+                cluster abstraction of the map, "jps" for
+                Jump Point Search, "bidirectional" for bidirectional A*,
+                or "anytime" for ARA* within a time budget
+        deadline_ms: time budget of the "anytime" method
+                     (default: ANYTIME_DEADLINE_MS)
+        reachability: ReachabilityIndex of the inflated grid (optional). If
+                      the goal is not reachable, no search toward it is run:
+                      the failure code goes to statistics.failure_reason and
+                      the path leads to the closest reachable cell instead.
+        abstraction: ClusterAbstraction for the "hpa" method, e.g. from
+                     FieldCache.get_abstraction (optional; built per query
+                     if not given)
+        use_potential: for the "jps" method, rank jump points by g +
+                       potential instead of g + octile distance (see
+                       jps_search)
 
     Returns:
         path: list of (row, col) tuples
     """
+    if reachability is not None:
+        reason = reachability.check(start, goal)
+        if reason is not None:
+            return _unreachable_path(potential, start, goal, reachability, reason, statistics)
+
     # First try: A* search using potential as heuristic
-    path, nodes_explored = astar_search(potential, start, goal)
+    if method == "astar":
+        path, nodes_explored = astar_search(potential, start, goal, statistics=statistics)
+    elif method == "hpa":
+        from planner.hierarchical import hierarchical_search
+        path, nodes_explored = hierarchical_search(
+            potential, start, goal, statistics=statistics, abstraction=abstraction
+        )
+    elif method == "jps":
+        from planner.jump_point import jps_search
+        path, nodes_explored = jps_search(potential, start, goal, use_potential=use_potential)
+    elif method == "bidirectional":
+        from planner.bidirectional import bidirectional_search
+        path, nodes_explored = bidirectional_search(potential, start, goal, statistics=statistics)
+    elif method == "anytime":
+        from planner.anytime import anytime_search
+        path, nodes_explored = anytime_search(
+            potential, start, goal, deadline_ms=deadline_ms, statistics=statistics
+        )
+    else:
+        raise ValueError(f"Unknown search method: {method}")
 
     if statistics:
         statistics.nodes_explored += nodes_explored
@@ -36,6 +108,14 @@ def extract_path(potential, start, goal, statistics=None):
     if path and path[-1] == goal:
         return path
 
+    # Out of time: keep the best prefix rather than risk a cycling descent
+    if method == "anytime" and path:
+        print("Anytime search ran out of time: returning the best partial path.")
+        _record_failure(statistics, FAILURE_DEADLINE)
+        return path
+
+    _record_failure(statistics, FAILURE_SEARCH_EXHAUSTED)
+
     # A* failed - likely no valid path exists
     if not path:
         print("A* search failed: no valid path exists from start to goal.")
@@ -48,78 +128,161 @@ def extract_path(potential, start, goal, statistics=None):
     return gradient_descent_path(potential, start, goal)
 
 
-def astar_search(potential, start, goal):
+def astar_search(potential, start, goal, statistics=None):
     """
     A* pathfinding using the potential field as a heuristic.
 
+    Cells are addressed by flat index (row * cols + col). Field values are
+    read on first touch and g-scores live in a dict, so a search costs what
+    it explores, not what the map holds. Outdated heap entries are skipped
+    when popped (lazy deletion) instead of being removed.
+
+    Each push records its cell and the entry it was expanded from, so a
+    heap entry carries a parent pointer rather than a copy of its path. The
+    potential is not a consistent heuristic, so a cell can be reopened after
+    its descendants were pushed; keeping the pointer per entry (not per
+    cell) preserves the exact route each entry was reached by. The path is
+    rebuilt once, when the goal is popped.
+
+    If statistics is given, heap pushes/pops and re-expansions (cells
+    expanded more than once) are added to it; nodes_explored is returned
+    for the caller to record.
+
     Returns:
         tuple: (path, nodes_explored)
     """
     from heapq import heappush, heappop
 
-    rows = len(potential)
-    cols = len(potential[0])
+    rows, cols = _field_shape(potential)
+
+    inf = float("inf")
+    values = _flat_values(potential)
+    g_scores = {}
+    best_g = g_scores.get
+    expanded = set()
+
+    # Parent pointers, one slot per heap push
+    entry_cells = []
+    entry_parents = []
 
-    # Priority queue: (f_score, g_score, position, path)
-    open_set = []
-    heappush(open_set, (potential[start[0]][start[1]], 0, start, [start]))
+    # Neighbor offsets in NEIGHBORS order: (dr, dc, flat offset, move cost)
+    moves = flat_moves(cols)
 
-    # Track best g_score for each cell
-    g_scores = {start: 0}
+    start_index = start[0] * cols + start[1]
+    goal_index = goal[0] * cols + goal[1]
+
+    # Priority queue: (f_score, g_score, flat index, entry id)
+    open_set = [(values[start_index], 0, start_index, 0)]
+    g_scores[start_index] = 0
+    entry_cells.append(start_index)
+    entry_parents.append(-1)
 
     # Limit iterations to prevent infinite loops
     max_iterations = rows * cols * 4
     iterations = 0
     nodes_explored = 0
+    reexpansions = 0
 
     while open_set and iterations < max_iterations:
         iterations += 1
-        f_score, g_score, current, path = heappop(open_set)
+        f_score, g_score, current, entry = heappop(open_set)
+
+        # Outdated entry: a cheaper route to this cell was found after the push
+        if g_score > g_scores[current]:
+            continue
+
         nodes_explored += 1
+        if current in expanded:
+            reexpansions += 1
+        expanded.add(current)
 
-        if current == goal:
-            return path, nodes_explored
+        if current == goal_index:
+            _record_heap_counters(statistics, len(entry_cells), iterations, reexpansions)
+            return _reconstruct_path(entry_cells, entry_parents, entry, cols), nodes_explored
 
-        r, c = current
+        r, c = divmod(current, cols)
 
-        for dr, dc in NEIGHBORS:
+        for dr, dc, offset, step_cost in moves:
             nr, nc = r + dr, c + dc
 
             # Check bounds
             if not (0 <= nr < rows and 0 <= nc < cols):
                 continue
 
-            neighbor = (nr, nc)
+            neighbor = current + offset
+            h = values[neighbor]
 
             # Skip obstacles
-            if potential[nr][nc] == float("inf"):
+            if h == inf:
                 continue
 
-            # Calculate cost (diagonal moves cost more)
-            move_cost = 1.414 if (dr != 0 and dc != 0) else 1.0
-            tentative_g = g_score + move_cost
+            tentative_g = g_score + step_cost
 
             # Only consider if this is a better path
-            if neighbor not in g_scores or tentative_g < g_scores[neighbor]:
+            if tentative_g < best_g(neighbor, inf):
                 g_scores[neighbor] = tentative_g
-                f_score = tentative_g + potential[nr][nc]
-                new_path = path + [neighbor]
-                heappush(open_set, (f_score, tentative_g, neighbor, new_path))
+                heappush(open_set, (tentative_g + h, tentative_g, neighbor, len(entry_cells)))
+                entry_cells.append(neighbor)
+                entry_parents.append(entry)
 
+    _record_heap_counters(statistics, len(entry_cells), iterations, reexpansions)
     return [], nodes_explored
 
 
+def _unreachable_path(potential, start, goal, reachability, reason, statistics):
+    """
+    Path to the reachable cell closest to goal, for queries the
+    reachability index rejected. The search is confined to start's
+    component and always ends at its target.
+    """
+    print(f"No path to the goal ({reason}): heading for the closest reachable cell.")
+    _record_failure(statistics, reason)
+
+    closest = reachability.closest_reachable(start, goal)
+    if closest == tuple(start):
+        return [tuple(start)]
+
+    path, nodes_explored = astar_search(potential, start, closest, statistics=statistics)
+    if statistics:
+        statistics.nodes_explored += nodes_explored
+    return path
+
+
+def _record_failure(statistics, reason):
+    if statistics and statistics.failure_reason is None:
+        statistics.failure_reason = reason
+
+
+def _record_heap_counters(statistics, pushes, pops, reexpansions):
+    if statistics:
+        statistics.heap_pushes += pushes
+        statistics.heap_pops += pops
+        statistics.reexpansions += reexpansions
+
+
+def _reconstruct_path(entry_cells, entry_parents, entry, cols):
+    """Walks parent pointers back from entry and returns the (row, col) path."""
+    path = []
+    while entry != -1:
+        path.append(divmod(entry_cells[entry], cols))
+        entry = entry_parents[entry]
+    path.reverse()
+    return path
+
+
 def gradient_descent_path(potential, start, goal):
     """
     Simple gradient descent following the potential field.
     Allows revisiting cells but detects cycles.
     """
+    rows, cols = _field_shape(potential)
+    values = _flat_values(potential)
     path = [start]
     current = start
     recent_positions = deque(maxlen=20)  # Track recent positions to detect cycles
     recent_positions.append(start)
 
-    max_steps = len(potential) * len(potential[0]) * 2
+    max_steps = rows * cols * 2
 
     for step in range(max_steps):
         if current == goal:
@@ -133,9 +296,9 @@ def gradient_descent_path(potential, start, goal):
         for dr, dc in NEIGHBORS:
             nr, nc = r + dr, c + dc
 
-            if 0 <= nr < len(potential) and 0 <= nc < len(potential[0]):
+            if 0 <= nr < rows and 0 <= nc < cols:
                 neighbor = (nr, nc)
-                v = potential[nr][nc]
+                v = values[nr * cols + nc]
 
                 if v < best_value:
                     best_value = v
@@ -158,3 +321,48 @@ def gradient_descent_path(potential, start, goal):
 
     print("Path extraction failed: exceeded step limit.")
     return path
+
+
+def _flat_values(potential):
+    """
+    Returns the field indexable by flat index (row * cols + col).
+
+    Nothing is copied up front: ndarray (and memory-mapped) and nested-list
+    fields are read one cell at a time, the first time a search touches the
+    cell, and lazy fields compute cells only as they are read. Setting up a
+    search therefore costs nothing per cell of the map.
+    """
+    if isinstance(potential, LazyPotentialField):
+        return potential.flat
+    return _CellValues(potential)
+
+
+def _field_shape(potential):
+    """Returns (rows, cols) of a field in any of its forms."""
+    if hasattr(potential, "shape"):
+        return potential.shape[0], potential.shape[1]
+    return len(potential), len(potential[0])
+
+
+class _CellValues(dict):
+    """
+    Field values by flat index, memoized on first read.
+
+    Cells are converted to Python floats once; the searches then read them
+    at dict speed instead of paying for numpy scalar access on every look.
+    """
+
+    __slots__ = ("_read",)
+
+    def __init__(self, potential):
+        super().__init__()
+        if isinstance(potential, np.ndarray):
+            # item() returns a Python float without creating a numpy scalar
+            self._read = potential.reshape(-1).item
+        else:
+            cols = len(potential[0])
+            self._read = lambda index: potential[index // cols][index % cols]
+
+    def __missing__(self, index):
+        value = self[index] = self._read(index)
+        return value
@@ -1,15 +1,60 @@
 import math
+import numpy as np
 from config.settings import (
     ATTRACTIVE_GAIN,
     REPULSIVE_GAIN,
     OBSTACLE_INFLUENCE,
-    OBSTACLE
+    OBSTACLE,
+    POTENTIAL_TILE_SIZE,
 )
+from map.occupancy_grid import grid_rows
+from planner.distance_transform import (
+    distance_transform,
+    euclidean_distance_transform,
+    capped_distance_transform_array,
+)
+
+def compute_potential_field(grid, goal, distance_method=None, backend="python"):
+    """
+    Builds the combined attractive + repulsive potential for every cell.
+
+    Args:
+        grid: 2D occupancy grid (usually already inflated)
+        goal: (row, col) goal position
+        distance_method: how nearest-obstacle distances are obtained:
+                         "exact" / "capped" use the distance transform,
+                         "brute" scans the whole grid per cell (slow);
+                         default "exact" for the python backend and the
+                         vectorized "capped" for the numpy backend
+        backend: "python" returns nested lists, "numpy" computes the
+                 field with whole-array operations and returns an ndarray,
+                 "lazy" returns a LazyPotentialField that computes cells
+                 only when they are read
+
+    Returns:
+        potential: 2D list of floats (or float ndarray / LazyPotentialField),
+                   inf on obstacles
+    """
+    if backend == "numpy":
+        return compute_potential_field_array(grid, goal, distance_method or "capped")
+    if backend == "lazy":
+        from planner.lazy_potential import LazyPotentialField
+        return LazyPotentialField(grid, goal)
+    if backend != "python":
+        raise ValueError(f"Unknown potential field backend: {backend}")
 
-def compute_potential_field(grid, goal):
+    if distance_method is None:
+        distance_method = "exact"
+
+    grid = grid_rows(grid)
     rows = len(grid)
     cols = len(grid[0])
 
+    if distance_method == "brute":
+        obstacle_distances = None
+    else:
+        obstacle_distances = distance_transform(grid, distance_method)
+
     potential = [[0.0 for _ in range(cols)] for _ in range(rows)]
 
     for r in range(rows):
@@ -26,7 +71,10 @@ def compute_potential_field(grid, goal):
             U_att = ATTRACTIVE_GAIN * dist_goal
 
             # Repulsive Potential (push away from obstacles)
-            min_dist_obs = find_distance_to_nearest_obstacle(grid, r, c)
+            if obstacle_distances is None:
+                min_dist_obs = find_distance_to_nearest_obstacle(grid, r, c)
+            else:
+                min_dist_obs = obstacle_distances[r][c]
             
             if min_dist_obs <= OBSTACLE_INFLUENCE:
                 U_rep = REPULSIVE_GAIN * (1.0 / min_dist_obs - 1.0 / OBSTACLE_INFLUENCE) ** 2
@@ -39,6 +87,97 @@ def compute_potential_field(grid, goal):
     return potential
 
 
+def compute_potential_field_array(grid, goal, distance_method="capped"):
+    """
+    Vectorized potential field.
+
+    Produces the same values as the Python backend, but both potential terms
+    are evaluated as whole-array operations.
+
+    Args:
+        grid: 2D occupancy grid (nested lists or ndarray)
+        goal: (row, col) goal position
+        distance_method: "capped" (vectorized, default) or "exact"
+
+    Returns:
+        potential: float ndarray of shape (rows, cols), inf on obstacles
+    """
+    obstacles = np.asarray(grid) == OBSTACLE
+    rows, cols = obstacles.shape
+
+    if distance_method == "capped":
+        obstacle_distances = capped_distance_transform_array(obstacles)
+    elif distance_method == "exact":
+        obstacle_distances = np.asarray(euclidean_distance_transform(grid), dtype=float)
+    else:
+        raise ValueError(f"Unsupported distance method for numpy backend: {distance_method}")
+
+    # Attractive Potential: distance to goal, built from broadcast row/col offsets
+    dr = (np.arange(rows, dtype=float) - goal[0]) ** 2
+    dc = (np.arange(cols, dtype=float) - goal[1]) ** 2
+    potential = np.sqrt(dr[:, None] + dc[None, :])
+    potential *= ATTRACTIVE_GAIN
+
+    # Repulsive Potential: only free cells within OBSTACLE_INFLUENCE
+    near = (obstacle_distances <= OBSTACLE_INFLUENCE) & ~obstacles
+    d = obstacle_distances[near]
+    potential[near] += REPULSIVE_GAIN * (1.0 / d - 1.0 / OBSTACLE_INFLUENCE) ** 2
+
+    potential[obstacles] = np.inf
+
+    return potential
+
+
+def compute_potential_field_tiled(grid, goal, output_path, tile_size=None):
+    """
+    Out-of-core potential field.
+
+    The grid is processed in square tiles, each padded with a halo of
+    OBSTACLE_INFLUENCE cells so that every obstacle that repels a cell of
+    the tile is visible; results match compute_potential_field_array. Each
+    tile is written straight into a .npy file, so peak memory depends on
+    tile_size and not on the map size. The grid itself may be a memory-mapped
+    array (see load_grid_binary).
+
+    Args:
+        grid: 2D occupancy grid (nested lists, ndarray / memmap or OccupancyGrid)
+        goal: (row, col) goal position
+        output_path: .npy file to write the field to
+        tile_size: tile edge in cells (default: POTENTIAL_TILE_SIZE)
+
+    Returns:
+        potential: read-only memory-mapped float ndarray backed by output_path
+    """
+    if tile_size is None:
+        tile_size = POTENTIAL_TILE_SIZE
+
+    cells = grid if hasattr(grid, "shape") else np.asarray(grid)
+    rows, cols = cells.shape
+    halo = int(math.ceil(OBSTACLE_INFLUENCE))
+
+    potential = np.lib.format.open_memmap(output_path, mode="w+", dtype=np.float64, shape=(rows, cols))
+
+    for r0 in range(0, rows, tile_size):
+        r1 = min(rows, r0 + tile_size)
+        for c0 in range(0, cols, tile_size):
+            c1 = min(cols, c0 + tile_size)
+
+            pr0, pr1 = max(0, r0 - halo), min(rows, r1 + halo)
+            pc0, pc1 = max(0, c0 - halo), min(cols, c1 + halo)
+
+            # The attractive term only depends on the offset to the goal,
+            # so the tile is evaluated on its own with a shifted goal
+            local_goal = (goal[0] - pr0, goal[1] - pc0)
+            tile = compute_potential_field_array(np.asarray(cells[pr0:pr1, pc0:pc1]), local_goal)
+
+            potential[r0:r1, c0:c1] = tile[r0 - pr0:r1 - pr0, c0 - pc0:c1 - pc0]
+
+    potential.flush()
+    del potential
+
+    return np.load(output_path, mmap_mode="r")
+
+
 def find_distance_to_nearest_obstacle(grid, r, c):
     rows = len(grid)
     cols = len(grid[0])
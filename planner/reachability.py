@@ -0,0 +1,237 @@
+import numpy as np
+
+from config.settings import OBSTACLE
+from planner.path_extractor import STRAIGHT_COST, DIAGONAL_COST
+from planner.statistics import (
+    FAILURE_GOAL_BLOCKED,
+    FAILURE_START_ENCLOSED,
+    FAILURE_DISCONNECTED,
+)
+
+# The 8 neighbours of a cell in clockwise order, starting above it
+RING = [(-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)]
+
+
+def label_components(inflated_grid):
+    """
+    Labels the 8-connected components of free space in an inflated grid.
+
+    Free cells are grouped into horizontal runs; runs on neighbouring rows
+    that touch (diagonally included) are joined with union-find, so the
+    Python work grows with the number of runs, not the number of cells.
+
+    Args:
+        inflated_grid: occupancy grid with obstacles inflated for the robot
+
+    Returns:
+        labels: int32 array of the grid's shape, the component number
+                (0, 1, ...) of every free cell and -1 on obstacles
+    """
+    return _label(np.asarray(inflated_grid) == OBSTACLE)
+
+
+class ReachabilityIndex:
+    """
+    Answers "can the robot get from start to goal?" without searching.
+
+    Wraps the component labels of an inflated grid (see label_components).
+    A start inside an inflated obstacle is allowed, as in astar_search: it
+    reaches the components of its free neighbours.
+
+    Cells can be opened or blocked afterwards with set_cell. Opening a cell
+    merges the components around it; blocking one only relabels the grid if
+    it may have split its component.
+    """
+
+    def __init__(self, labels):
+        """
+        Args:
+            labels: component labels from label_components (not modified;
+                    copied on the first set_cell)
+        """
+        self.labels = labels
+        self._next_label = None
+        self._owned = False
+
+    @property
+    def shape(self):
+        return self.labels.shape
+
+    def component(self, cell):
+        """Component number of a cell, -1 if it is blocked."""
+        return int(self.labels[cell[0], cell[1]])
+
+    def start_components(self, start):
+        """Set of the components a search from start can enter."""
+        label = self.component(start)
+        if label >= 0:
+            return {label}
+
+        rows, cols = self.labels.shape
+        r, c = start
+        return {
+            int(self.labels[r + dr, c + dc])
+            for dr, dc in RING
+            if 0 <= r + dr < rows and 0 <= c + dc < cols and self.labels[r + dr, c + dc] >= 0
+        }
+
+    def check(self, start, goal):
+        """
+        Returns None if goal is reachable from start, otherwise the failure
+        code: FAILURE_GOAL_BLOCKED, FAILURE_START_ENCLOSED or
+        FAILURE_DISCONNECTED.
+        """
+        if tuple(start) == tuple(goal):
+            return None
+        if self.component(goal) < 0:
+            return FAILURE_GOAL_BLOCKED
+
+        components = self.start_components(start)
+        if not components:
+            return FAILURE_START_ENCLOSED
+        if self.component(goal) not in components:
+            return FAILURE_DISCONNECTED
+        return None
+
+    def connected(self, start, goal):
+        return self.check(start, goal) is None
+
+    def closest_reachable(self, start, goal):
+        """
+        The cell reachable from start that is closest to goal (octile
+        distance). Returns start if nothing is reachable.
+        """
+        components = self.start_components(start)
+        if not components:
+            return tuple(start)
+
+        reachable = np.flatnonzero(np.isin(self.labels, list(components)))
+        rows, cols = np.divmod(reachable, self.labels.shape[1])
+        dr = np.abs(rows - goal[0])
+        dc = np.abs(cols - goal[1])
+        distance = DIAGONAL_COST * np.minimum(dr, dc) + STRAIGHT_COST * np.abs(dr - dc)
+
+        best = int(np.argmin(distance))
+        return int(rows[best]), int(cols[best])
+
+    def set_cell(self, cell, blocked):
+        """
+        Updates the index after a cell of the inflated grid changed.
+
+        Args:
+            cell: (row, col)
+            blocked: True if the cell is now an obstacle
+        """
+        if not self._owned:
+            # Indexes are created per query, so the O(map) work waits until here
+            self.labels = np.array(self.labels, dtype=np.int32)
+            self._next_label = int(self.labels.max()) + 1 if self.labels.size else 0
+            self._owned = True
+
+        r, c = cell
+        was_blocked = self.labels[r, c] < 0
+        if blocked == was_blocked:
+            return
+
+        neighbors = self._free_ring(r, c)
+
+        if not blocked:
+            # Opening a cell joins every component around it
+            around = {int(self.labels[n]) for n in neighbors}
+            if around:
+                keep = min(around)
+                others = list(around - {keep})
+                if others:
+                    self.labels[np.isin(self.labels, others)] = keep
+            else:
+                keep = self._next_label
+                self._next_label += 1
+            self.labels[r, c] = keep
+            return
+
+        self.labels[r, c] = -1
+
+        # Routes through the cell can go around it unless its free
+        # neighbours fall apart into several groups
+        if _ring_groups(r, c, set(neighbors)) > 1:
+            self.labels = _label(self.labels < 0)
+            self._next_label = int(self.labels.max()) + 1 if self.labels.size else 0
+
+    def _free_ring(self, r, c):
+        rows, cols = self.labels.shape
+        return [
+            (r + dr, c + dc)
+            for dr, dc in RING
+            if 0 <= r + dr < rows and 0 <= c + dc < cols and self.labels[r + dr, c + dc] >= 0
+        ]
+
+
+def _ring_groups(r, c, free):
+    """Number of 8-connected groups the free neighbours of (r, c) form among themselves."""
+    cells = [(r + dr, c + dc) for dr, dc in RING]
+    groups = 0
+    seen = set()
+    for cell in cells:
+        if cell not in free or cell in seen:
+            continue
+        groups += 1
+        stack = [cell]
+        seen.add(cell)
+        while stack:
+            cr, cc = stack.pop()
+            for other in cells:
+                if other in free and other not in seen and max(abs(other[0] - cr), abs(other[1] - cc)) == 1:
+                    seen.add(other)
+                    stack.append(other)
+    return groups
+
+
+def _label(blocked):
+    """Component labels for a boolean obstacle mask (see label_components)."""
+    rows, cols = blocked.shape
+    labels = np.full((rows, cols), -1, dtype=np.int32)
+    if blocked.all():
+        return labels
+
+    # Runs of free cells, in row-major order: [start, end) on their row
+    padded = np.zeros((rows, cols + 2), dtype=np.int8)
+    padded[:, 1:-1] = ~blocked
+    edges = np.diff(padded, axis=1)
+    run_rows, run_starts = np.nonzero(edges == 1)
+    _, run_ends = np.nonzero(edges == -1)
+
+    # Keys that order runs by row first; rows never overlap
+    width = cols + 2
+    start_keys = run_rows * width + run_starts
+    end_keys = run_rows * width + run_ends
+
+    # Runs on the row above that touch each run (a contiguous range)
+    above = (run_rows - 1) * width
+    low = np.searchsorted(end_keys, above + run_starts, side="left")
+    high = np.searchsorted(start_keys, above + run_ends, side="right")
+    counts = np.maximum(high - low, 0)
+
+    lower = np.repeat(np.arange(len(run_rows)), counts)
+    upper = np.repeat(low, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    parent = list(range(len(run_rows)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b in zip(upper.tolist(), lower.tolist()):
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            if ra < rb:
+                parent[rb] = ra
+            else:
+                parent[ra] = rb
+
+    roots = np.array([find(i) for i in range(len(parent))])
+    _, components = np.unique(roots, return_inverse=True)
+
+    labels[~blocked] = np.repeat(components.astype(np.int32), run_ends - run_starts)
+    return labels
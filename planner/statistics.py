@@ -1,12 +1,32 @@
 import time
 import math
+import tracemalloc
+from contextlib import contextmanager
+
+import numpy as np
+
+from config.settings import OBSTACLE
+from map.occupancy_grid import OccupancyGrid
+
+# Failure codes the planner records in PlanningStatistics.failure_reason
+FAILURE_GOAL_BLOCKED = "goal_blocked"          # goal lies inside an (inflated) obstacle
+FAILURE_START_ENCLOSED = "start_enclosed"      # no free cell next to the start
+FAILURE_DISCONNECTED = "disconnected"          # start and goal in different components
+FAILURE_SEARCH_EXHAUSTED = "search_exhausted"  # search ended without reaching the goal
+FAILURE_DEADLINE = "deadline"                  # anytime search ran out of time
 
 class PlanningStatistics:
     """
     Tracks and stores statistics during the planning process.
     """
 
-    def __init__(self):
+    def __init__(self, track_memory=False):
+        """
+        Args:
+            track_memory: record peak memory of every stage with tracemalloc
+                          (adds noticeable overhead while a stage runs)
+        """
+        self.track_memory = track_memory
         self.reset()
 
     def reset(self):
@@ -16,9 +36,18 @@ class PlanningStatistics:
         self.planning_time = 0.0
 
         self.nodes_explored = 0
+        self.abstract_nodes_explored = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.heap_pushes = 0
+        self.heap_pops = 0
+        self.reexpansions = 0
         self.path_length = 0
         self.path_cost = 0.0
 
+        # Anytime search: one entry per improved solution, in order
+        self.solutions = []
+
         self.success = False
         self.failure_reason = None
 
@@ -26,6 +55,44 @@ class PlanningStatistics:
         self.num_obstacles = 0
         self.robot_size = (0, 0)
 
+        # Per-stage instrumentation, in first-seen order
+        self.stage_times = {}    # stage name -> seconds
+        self.stage_peaks = {}    # stage name -> peak bytes allocated
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Measures a pipeline stage:
+
+            with stats.stage("inflate"):
+                inflated = inflate_obstacles(grid)
+
+        Time is taken with perf_counter_ns and summed over repeated stages
+        of the same name. With track_memory, the peak of memory allocated
+        inside the stage is recorded too (stages should not be nested then,
+        since tracemalloc has a single peak counter).
+        """
+        started_tracing = False
+        if self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter_ns() - start) / 1e9
+            self.stage_times[name] = self.stage_times.get(name, 0.0) + elapsed
+
+            if self.track_memory:
+                peak = max(0, tracemalloc.get_traced_memory()[1] - baseline)
+                self.stage_peaks[name] = max(self.stage_peaks.get(name, 0), peak)
+                if started_tracing:
+                    tracemalloc.stop()
+
     def start_timer(self):
         """Start the planning timer."""
         self.start_time = time.time()
@@ -38,10 +105,14 @@ class PlanningStatistics:
 
     def set_map_info(self, grid, robot_width, robot_height):
         """Store map-related information."""
-        self.map_size = (len(grid), len(grid[0]) if grid else 0)
+        self.map_size = (len(grid), len(grid[0]) if len(grid) else 0)
 
-        # Count obstacles
-        self.num_obstacles = sum(row.count(1) for row in grid)
+        # Count obstacles (cached on an OccupancyGrid; also works for
+        # nested lists and ndarrays)
+        if isinstance(grid, OccupancyGrid):
+            self.num_obstacles = grid.obstacle_count
+        else:
+            self.num_obstacles = int(np.count_nonzero(np.asarray(grid) == OBSTACLE))
 
         self.robot_size = (robot_height, robot_width)
 
@@ -59,10 +130,33 @@ class PlanningStatistics:
             dist = math.sqrt((r2 - r1) ** 2 + (c2 - c1) ** 2)
             self.path_cost += dist
 
+    def record_solution(self, cost, suboptimality, elapsed_ms):
+        """
+        Store an intermediate solution of an anytime search.
+
+        Args:
+            cost: path cost of the solution
+            suboptimality: bound on cost / optimal cost
+            elapsed_ms: time since the search started
+        """
+        self.solutions.append({
+            "cost": cost,
+            "suboptimality": suboptimality,
+            "elapsed_ms": elapsed_ms,
+        })
+
     def set_success(self, success, failure_reason=None):
-        """Mark planning as successful or failed."""
+        """
+        Mark planning as successful or failed.
+
+        A failure code the planner already recorded (FAILURE_*) is more
+        specific than the caller's message and is kept.
+        """
         self.success = success
-        self.failure_reason = failure_reason
+        if success:
+            self.failure_reason = None
+        elif self.failure_reason is None:
+            self.failure_reason = failure_reason
 
     def get_summary(self):
         """
@@ -87,6 +181,31 @@ class PlanningStatistics:
         lines.append("Planning Performance:")
         lines.append(f"  - Planning Time: {self.planning_time * 1000:.2f} ms")
         lines.append(f"  - Nodes Explored: {self.nodes_explored}")
+        if self.heap_pops:
+            lines.append(f"  - Heap Pushes / Pops: {self.heap_pushes} / {self.heap_pops}")
+            lines.append(f"  - Re-expansions: {self.reexpansions}")
+        if self.abstract_nodes_explored:
+            lines.append(f"  - Abstract Nodes Explored: {self.abstract_nodes_explored}")
+        if self.cache_hits or self.cache_misses:
+            lines.append(f"  - Field Cache: {self.cache_hits} hits, {self.cache_misses} misses")
+
+        if self.solutions:
+            lines.append("")
+            lines.append("Anytime Solutions:")
+            for solution in self.solutions:
+                lines.append(
+                    f"  - {solution['elapsed_ms']:.2f} ms: cost {solution['cost']:.2f} "
+                    f"(within {solution['suboptimality']:.2f}x of optimal)"
+                )
+
+        if self.stage_times:
+            lines.append("")
+            lines.append("Stage Breakdown:")
+            for name, seconds in self.stage_times.items():
+                line = f"  - {name}: {seconds * 1000:.2f} ms"
+                if name in self.stage_peaks:
+                    line += f" (peak {self.stage_peaks[name] / 1024:.1f} KiB)"
+                lines.append(line)
 
         if self.success:
             lines.append("")
@@ -104,7 +223,7 @@ class PlanningStatistics:
         """
         Returns statistics as a dictionary for easy export.
         """
-        return {
+        result = {
             "success": self.success,
             "failure_reason": self.failure_reason,
             "planning_time_ms": self.planning_time * 1000,
@@ -114,6 +233,22 @@ class PlanningStatistics:
             "robot_width": self.robot_size[1],
             "robot_height": self.robot_size[0],
             "nodes_explored": self.nodes_explored,
+            "abstract_nodes_explored": self.abstract_nodes_explored,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
             "path_length": self.path_length,
             "path_cost": self.path_cost,
+            "heap_pushes": self.heap_pushes,
+            "heap_pops": self.heap_pops,
+            "reexpansions": self.reexpansions,
+            "anytime_solutions": len(self.solutions),
+            "suboptimality_bound": self.solutions[-1]["suboptimality"] if self.solutions else None,
         }
+
+        # Stages are flattened so the dict stays a single CSV row
+        for name, seconds in self.stage_times.items():
+            result[f"stage_{name}_ms"] = seconds * 1000
+        for name, peak in self.stage_peaks.items():
+            result[f"stage_{name}_peak_kb"] = peak / 1024
+
+        return result
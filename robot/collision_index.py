@@ -0,0 +1,82 @@
+import numpy as np
+from config.settings import OBSTACLE, ROBOT_WIDTH, ROBOT_HEIGHT
+
+
+class CollisionIndex:
+    """
+    Answers robot footprint collision queries in O(1).
+
+    Built once per grid from a summed-area table (integral image) of obstacle
+    occupancy: the number of obstacles inside any rectangle is four lookups.
+    Uses the same footprint and rules as check_robot_collision: a robot at
+    (r, c) covers rows r - h//2 .. r + h//2 and cols c - w//2 .. c + w//2,
+    and a footprint leaving the grid counts as a collision.
+    """
+
+    def __init__(self, grid):
+        obstacles = np.asarray(grid) == OBSTACLE
+        self.rows, self.cols = obstacles.shape
+
+        # table[r, c] = number of obstacles in grid[:r, :c]
+        self.table = np.zeros((self.rows + 1, self.cols + 1), dtype=np.int64)
+        np.cumsum(np.cumsum(obstacles, axis=0), axis=1, out=self.table[1:, 1:])
+
+    def collides(self, position, robot_width=None, robot_height=None):
+        """
+        Returns True if a robot centered at position would collide.
+        """
+        half_w, half_h = _half_sizes(robot_width, robot_height)
+        r, c = position
+
+        r0, r1 = r - half_h, r + half_h + 1
+        c0, c1 = c - half_w, c + half_w + 1
+
+        # Out of bounds = collision
+        if r0 < 0 or c0 < 0 or r1 > self.rows or c1 > self.cols:
+            return True
+
+        t = self.table
+        return bool(t[r1, c1] - t[r0, c1] - t[r1, c0] + t[r0, c0] > 0)
+
+    def collides_many(self, positions, robot_width=None, robot_height=None):
+        """
+        Vectorized collision check for many positions (e.g. a whole path).
+
+        Args:
+            positions: sequence of (row, col) tuples or an (N, 2) array
+
+        Returns:
+            boolean ndarray of length N, True where the robot collides
+        """
+        half_w, half_h = _half_sizes(robot_width, robot_height)
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+
+        r0 = positions[:, 0] - half_h
+        r1 = positions[:, 0] + half_h + 1
+        c0 = positions[:, 1] - half_w
+        c1 = positions[:, 1] + half_w + 1
+
+        out_of_bounds = (r0 < 0) | (c0 < 0) | (r1 > self.rows) | (c1 > self.cols)
+
+        # Clip so that out-of-bounds rows can still be looked up safely
+        r0c, r1c = np.clip(r0, 0, self.rows), np.clip(r1, 0, self.rows)
+        c0c, c1c = np.clip(c0, 0, self.cols), np.clip(c1, 0, self.cols)
+
+        t = self.table
+        counts = t[r1c, c1c] - t[r0c, c1c] - t[r1c, c0c] + t[r0c, c0c]
+
+        return out_of_bounds | (counts > 0)
+
+    def path_collides(self, path, robot_width=None, robot_height=None):
+        """Returns True if the robot collides anywhere along path."""
+        if not path:
+            return False
+        return bool(self.collides_many(path, robot_width, robot_height).any())
+
+
+def _half_sizes(robot_width, robot_height):
+    if robot_width is None:
+        robot_width = ROBOT_WIDTH
+    if robot_height is None:
+        robot_height = ROBOT_HEIGHT
+    return robot_width // 2, robot_height // 2
@@ -1,12 +1,127 @@
 import csv
+import struct
 
-def export_path(path, filename):
+# Binary waypoint format:
+#   header (9 bytes, little endian): magic, version, waypoint count
+#   body: per waypoint, the row and col change from the previous waypoint
+#   (the first from (0, 0)) as zigzag-encoded varints
+WAYPOINT_MAGIC = b"MNWP"
+WAYPOINT_VERSION = 1
+WAYPOINT_HEADER = struct.Struct("<4sBI")
+
+EXPORT_FORMATS = ("csv", "delta", "binary")
+
+
+def export_path(path, filename, format="csv"):
+    """
+    Saves the path (or a compressed waypoint list) for the robot.
+
+    Args:
+        path: list of (row, col) tuples
+        filename: output file
+        format: "csv" writes one absolute row, col line per point;
+                "delta" writes the first point, then per-point changes
+                (drow, dcol); "binary" writes the changes as zigzag varints
+                (usually 2 bytes per waypoint)
     """
-    Saves the path as a CSV file: row, col
+    if format == "csv":
+        with open(filename, mode="w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["row", "col"])
+
+            for (r, c) in path:
+                writer.writerow([r, c])
+
+    elif format == "delta":
+        with open(filename, mode="w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["drow", "dcol"])
+
+            for dr, dc in _deltas(path):
+                writer.writerow([dr, dc])
+
+    elif format == "binary":
+        body = bytearray()
+        for dr, dc in _deltas(path):
+            _write_varint(body, _zigzag(dr))
+            _write_varint(body, _zigzag(dc))
+
+        with open(filename, mode="wb") as file:
+            file.write(WAYPOINT_HEADER.pack(WAYPOINT_MAGIC, WAYPOINT_VERSION, len(path)))
+            file.write(body)
+
+    else:
+        raise ValueError(f"Unknown export format: {format}")
+
+
+def load_path(filename):
+    """
+    Reads a path written by export_path in any format.
+
+    Returns:
+        path: list of (row, col) tuples
     """
-    with open(filename, mode="w", newline="") as file:
-        writer = csv.writer(file)
-        writer.writerow(["row", "col"])
+    with open(filename, mode="rb") as file:
+        data = file.read()
+
+    if data.startswith(WAYPOINT_MAGIC):
+        _, version, count = WAYPOINT_HEADER.unpack_from(data)
+        if version != WAYPOINT_VERSION:
+            raise ValueError(f"Unsupported waypoint file version: {version}")
+
+        values = []
+        pos = WAYPOINT_HEADER.size
+        for _ in range(2 * count):
+            value, pos = _read_varint(data, pos)
+            values.append(_unzigzag(value))
+        return _accumulate(zip(values[0::2], values[1::2]))
+
+    rows = list(csv.reader(data.decode().splitlines()))
+    header, points = rows[0], [(int(a), int(b)) for a, b in rows[1:]]
+    if header == ["drow", "dcol"]:
+        return _accumulate(points)
+    return points
+
+
+def _deltas(path):
+    previous = (0, 0)
+    for r, c in path:
+        yield r - previous[0], c - previous[1]
+        previous = (r, c)
+
+
+def _accumulate(deltas):
+    path = []
+    r = c = 0
+    for dr, dc in deltas:
+        r += dr
+        c += dc
+        path.append((r, c))
+    return path
+
+
+def _zigzag(value):
+    # Interleave signs so small negative numbers stay small: 0, -1, 1, -2 ... -> 0, 1, 2, 3 ...
+    return 2 * value if value >= 0 else -2 * value - 1
+
+
+def _unzigzag(value):
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
 
-        for (r, c) in path:
-            writer.writerow([r, c])
+def _read_varint(data, pos):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
@@ -0,0 +1,84 @@
+import numpy as np
+from config.settings import FREE, OBSTACLE
+from map.occupancy_grid import OccupancyGrid
+
+# Clearances are stored as uint16; anything further counts as this far
+MAX_CLEARANCE = np.iinfo(np.uint16).max
+
+
+class InflationPyramid:
+    """
+    Inflated grids for every robot size from one distance pass.
+
+    Level k holds, for every cell, the horizontal distance to the nearest
+    obstacle within k rows above or below it. A robot whose inflation radii
+    are (k rows, j columns) is blocked exactly where level k is <= j, so
+    the inflated grid of any size is a threshold of one level, and level k
+    costs one element-wise minimum on top of level k - 1. Sweeping robot
+    sizes from 1x1 to 5x5 builds three levels instead of inflating 25 times.
+
+    Produces the same grids as inflate_obstacles.
+    """
+
+    def __init__(self, grid):
+        """
+        Args:
+            grid: OccupancyGrid or 2D occupancy grid (not inflated)
+        """
+        self.grid = grid
+        self.cells = np.asarray(grid)
+        self.levels = [row_clearance(self.cells == OBSTACLE)]
+
+    def level(self, k):
+        """Clearance level k (uint16 array), built on first use."""
+        while len(self.levels) <= k:
+            self.levels.append(widen_clearance(self.levels[-1], self.levels[0], len(self.levels)))
+        return self.levels[k]
+
+    def inflated(self, robot_width, robot_height):
+        """
+        Returns the inflated grid for a robot size (an OccupancyGrid for an
+        OccupancyGrid, nested lists otherwise, like inflate_obstacles).
+        """
+        inflate_r, inflate_c = inflation_radii(robot_width, robot_height)
+        inflated_grid = threshold_clearance(self.cells, self.level(inflate_r), inflate_c)
+
+        if isinstance(self.grid, OccupancyGrid):
+            return OccupancyGrid(inflated_grid, self.grid.start, self.grid.goal)
+        return inflated_grid.tolist()
+
+
+def inflation_radii(robot_width, robot_height):
+    """Returns the (row, column) inflation radii of a robot size."""
+    return (robot_height - 1) // 2, (robot_width - 1) // 2
+
+
+def row_clearance(obstacles):
+    """
+    Level 0: distance from every cell to the nearest obstacle on its row
+    (0 on obstacles, MAX_CLEARANCE if the row has none).
+    """
+    rows, cols = obstacles.shape
+    positions = np.arange(cols, dtype=np.int64)
+    far = MAX_CLEARANCE + cols
+
+    # Nearest obstacle column at or left of each cell, and at or right of it
+    left = np.maximum.accumulate(np.where(obstacles, positions, -far), axis=1)
+    right = np.minimum.accumulate(np.where(obstacles, positions, far)[:, ::-1], axis=1)[:, ::-1]
+
+    clearance = np.minimum(positions - left, right - positions)
+    return np.minimum(clearance, MAX_CLEARANCE).astype(np.uint16)
+
+
+def widen_clearance(previous, base, k):
+    """Level k from level k - 1 and level 0: adds the rows k above and below."""
+    level = previous.copy()
+    if k < len(base):
+        np.minimum(level[k:], base[:-k], out=level[k:])
+        np.minimum(level[:-k], base[k:], out=level[:-k])
+    return level
+
+
+def threshold_clearance(cells, level, inflate_c):
+    """Inflated cells (uint8 array) from the clearance level of a robot's row radius."""
+    return np.where((level <= inflate_c) & (cells == FREE), OBSTACLE, cells).astype(np.uint8)
@@ -1,4 +1,7 @@
-from config.settings import OBSTACLE, ROBOT_WIDTH, ROBOT_HEIGHT
+import numpy as np
+from config.settings import FREE, OBSTACLE, ROBOT_WIDTH, ROBOT_HEIGHT
+from map.occupancy_grid import OccupancyGrid
+from robot.inflation_pyramid import inflation_radii
 
 def inflate_obstacles(grid, robot_width=None, robot_height=None):
     """
@@ -8,48 +11,58 @@ def inflate_obstacles(grid, robot_width=None, robot_height=None):
     We inflate obstacles so that planning can treat the robot as a point.
 
     Args:
-        grid: 2D list representing the occupancy grid
+        grid: OccupancyGrid or 2D list representing the occupancy grid
         robot_width: width of robot in grid cells (default from settings)
         robot_height: height of robot in grid cells (default from settings)
 
     Returns:
-        inflated_grid: new grid with inflated obstacles
+        inflated_grid: new grid with inflated obstacles (an OccupancyGrid
+                       for an OccupancyGrid, nested lists otherwise)
     """
     if robot_width is None:
         robot_width = ROBOT_WIDTH
     if robot_height is None:
         robot_height = ROBOT_HEIGHT
 
-    rows = len(grid)
-    cols = len(grid[0])
-
-    # Create a copy of the grid
-    inflated_grid = [row[:] for row in grid]
+    cells = np.asarray(grid)
 
     # Calculate inflation radius (half the robot size, rounded up)
-    inflate_r = (robot_height - 1) // 2
-    inflate_c = (robot_width - 1) // 2
+    inflate_r, inflate_c = inflation_radii(robot_width, robot_height)
+
+    # Separable rectangular dilation of the obstacle mask: a row pass
+    # followed by a column pass, each a sliding-window count
+    obstacles = cells == OBSTACLE
+    inflated_mask = _dilate_axis(_dilate_axis(obstacles, inflate_c, axis=1), inflate_r, axis=0)
 
-    # Find all obstacle cells
-    obstacles = []
-    for r in range(rows):
-        for c in range(cols):
-            if grid[r][c] == OBSTACLE:
-                obstacles.append((r, c))
+    # Only inflate free cells
+    inflated_grid = np.where(inflated_mask & (cells == FREE), OBSTACLE, cells)
 
-    # Inflate each obstacle
-    for obs_r, obs_c in obstacles:
-        for dr in range(-inflate_r, inflate_r + 1):
-            for dc in range(-inflate_c, inflate_c + 1):
-                nr, nc = obs_r + dr, obs_c + dc
+    if isinstance(grid, OccupancyGrid):
+        return OccupancyGrid(inflated_grid, grid.start, grid.goal)
+    return inflated_grid.tolist()
 
-                # Check bounds
-                if 0 <= nr < rows and 0 <= nc < cols:
-                    # Only inflate free cells
-                    if inflated_grid[nr][nc] == 0:
-                        inflated_grid[nr][nc] = OBSTACLE
 
-    return inflated_grid
+def _dilate_axis(mask, radius, axis):
+    """
+    1D dilation of a boolean mask along one axis.
+
+    A cell is set if any cell within radius of it along the axis is set.
+    Window counts come from prefix sums, so the cost does not depend on
+    radius.
+    """
+    if radius <= 0:
+        return mask
+
+    n = mask.shape[axis]
+    prefix = np.cumsum(mask, axis=axis, dtype=np.int32)
+    prefix = np.insert(prefix, 0, 0, axis=axis)
+
+    positions = np.arange(n)
+    upper = np.minimum(positions + radius + 1, n)
+    lower = np.maximum(positions - radius, 0)
+
+    counts = np.take(prefix, upper, axis=axis) - np.take(prefix, lower, axis=axis)
+    return counts > 0
 
 
 def check_robot_collision(grid, position, robot_width=None, robot_height=None):
@@ -92,3 +105,16 @@ def check_robot_collision(grid, position, robot_width=None, robot_height=None):
                 return True
 
     return False
+
+
+def robot_dimensions(robot_size=None):
+    """
+    Returns a robot size as a (height, width) tuple.
+
+    Args:
+        robot_size: (height, width) in grid cells, or None for the size in
+                    settings
+    """
+    if robot_size is None:
+        return (ROBOT_HEIGHT, ROBOT_WIDTH)
+    return (robot_size[0], robot_size[1])
@@ -0,0 +1,66 @@
+"""
+Benchmark Script
+
+Sweeps generated maps (open, maze, cluttered, corridor, rooms) over map
+sizes and robot sizes, times every pipeline stage and optionally compares
+the run against a stored baseline to catch performance regressions.
+
+Examples:
+    python3 run_benchmark.py --sizes 50 100 --robot-sizes 1 3
+    python3 run_benchmark.py --baseline evaluation/benchmark_baseline.json
+    python3 run_benchmark.py --sizes 1000 --backend lazy
+"""
+
+import argparse
+
+from evaluation.benchmark import (
+    BenchmarkRunner,
+    build_cases,
+    print_comparison,
+    DEFAULT_SIZES,
+    DEFAULT_ROBOT_SIZES,
+)
+from map.map_generator import MAP_FAMILIES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-Navigator scaling benchmark")
+    parser.add_argument("--families", nargs="+", default=list(MAP_FAMILIES), choices=MAP_FAMILIES)
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--robot-sizes", nargs="+", type=int, default=list(DEFAULT_ROBOT_SIZES))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--method", default="astar", help="search method passed to extract_path")
+    parser.add_argument("--backend", default="numpy", choices=("numpy", "python", "lazy"),
+                        help="potential field backend (lazy computes only the cells the search reads)")
+    parser.add_argument("--output", default="evaluation/benchmark_results.json")
+    parser.add_argument("--baseline", help="benchmark results JSON of an earlier run (--output) to compare against")
+    parser.add_argument("--min-slowdown", type=float, default=0.05,
+                        help="smallest relative slowdown that is flagged (default 0.05 = 5%%)")
+    args = parser.parse_args()
+
+    cases = build_cases(args.families, args.sizes, args.robot_sizes, args.seed)
+
+    print("\n" + "="*70)
+    print(" MICRO-NAVIGATOR SCALING BENCHMARK")
+    print("="*70)
+    print(f"Total cases: {len(cases)} ({args.repeats} repeats each)")
+    print("="*70)
+
+    runner = BenchmarkRunner(repeats=args.repeats, method=args.method, backend=args.backend)
+    runner.run(cases)
+    runner.print_table()
+
+    # Read the baseline before saving, in case it is the output file itself
+    comparisons = None
+    if args.baseline:
+        comparisons = runner.compare_to_baseline(args.baseline, args.min_slowdown)
+
+    runner.save_results(args.output)
+
+    if comparisons is not None:
+        print_comparison(comparisons)
+
+
+if __name__ == "__main__":
+    main()
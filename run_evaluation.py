@@ -9,6 +9,7 @@ import matplotlib
 matplotlib.use("Agg")
 
 from evaluation.evaluator import PerformanceEvaluator
+from config.settings import EVALUATION_WORKERS
 
 
 def main():
@@ -65,6 +66,21 @@ def main():
             "robot_width": 2,
             "robot_height": 2,
         },
+        # Compare search methods on the same maps
+        {
+            "name": "Scenario 3: Maze (Bidirectional)",
+            "map_file": "map/scenario3_maze.txt",
+            "robot_width": 1,
+            "robot_height": 1,
+            "method": "bidirectional",
+        },
+        {
+            "name": "Scenario 6: Large (Bidirectional)",
+            "map_file": "map/scenario6_large.txt",
+            "robot_width": 1,
+            "robot_height": 1,
+            "method": "bidirectional",
+        },
     ]
 
     print("\n" + "="*70)
@@ -74,7 +90,7 @@ def main():
     print("="*70)
 
     # Run all scenarios
-    evaluator.run_all_scenarios(scenarios)
+    evaluator.run_all_scenarios(scenarios, workers=EVALUATION_WORKERS)
 
     # Print comparison table
     evaluator.print_comparison_table()
@@ -0,0 +1,45 @@
+"""
+Planning Service
+
+Starts a resident planning daemon that keeps maps, inflated grids and
+potential fields warm and answers newline-delimited JSON requests.
+
+Examples:
+    python3 run_server.py
+    python3 run_server.py --tcp --port 8765 --preload map/scenario6_large.txt
+
+    echo '{"op": "plan", "map": "map/scenario3_maze.txt"}' | nc -U /tmp/micro-navigator.sock
+"""
+
+import argparse
+import asyncio
+
+from service.planning_server import PlanningServer
+from config.settings import SERVICE_SOCKET, SERVICE_HOST, SERVICE_PORT, SERVICE_WORKERS, SERVICE_MAP_DIR
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-Navigator planning service")
+    parser.add_argument("--socket", default=SERVICE_SOCKET, help="Unix socket path")
+    parser.add_argument("--tcp", action="store_true", help="listen on TCP instead of a Unix socket")
+    parser.add_argument("--host", default=SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=SERVICE_PORT)
+    parser.add_argument("--workers", type=int, default=SERVICE_WORKERS, help="planning threads")
+    parser.add_argument("--map-dir", default=SERVICE_MAP_DIR,
+                        help="directory of the map files clients may request")
+    parser.add_argument("--preload", nargs="+", default=[], help="map files to load at startup")
+    args = parser.parse_args()
+
+    server = PlanningServer(workers=args.workers, map_dir=args.map_dir)
+    for map_file in args.preload:
+        server.load_map(map_file)
+        print(f"Loaded {map_file}")
+
+    if args.tcp:
+        asyncio.run(server.serve(host=args.host, port=args.port))
+    else:
+        asyncio.run(server.serve(socket_path=args.socket))
+
+
+if __name__ == "__main__":
+    main()
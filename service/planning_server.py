@@ -0,0 +1,522 @@
+import os
+import json
+import time
+import signal
+import socket
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from config.settings import (
+    ROBOT_WIDTH,
+    ROBOT_HEIGHT,
+    FIELD_CACHE_DIR,
+    SERVICE_WORKERS,
+    SERVICE_MAP_DIR,
+    SERVICE_MAX_MAPS,
+    SERVICE_MAX_BATCH,
+)
+from map.grid_loader import load_grid, load_grid_binary, BINARY_MAGIC
+from planner.field_cache import FieldCache
+from planner.distance_matrix import distance_matrix, SearchPool
+from planner.path_extractor import extract_path
+from planner.statistics import PlanningStatistics
+
+# Requests and responses are single-line JSON objects; keep lines bounded
+MAX_LINE_BYTES = 16 * 1024 * 1024
+
+
+class PlanningServer:
+    """
+    Resident planning service.
+
+    Maps are loaded once and kept in memory (the max_maps most recently
+    used); inflated grids and potential fields stay warm in a FieldCache
+    keyed by (map, robot size, goal). Only map files inside the map
+    directory are served: requests name them by relative path, and absolute
+    paths or ".." are rejected. The server speaks newline-delimited JSON
+    over a Unix domain socket or localhost TCP. Every request runs in a
+    thread pool so the event loop keeps accepting connections, and requests
+    on one connection are answered as they finish (each response echoes
+    the request's "id").
+
+    Planning threads share the GIL, so concurrent plans overlap only where
+    numpy releases it (computing fields); the searches themselves take turns
+    on one core. Large distance matrices run in the SearchPool's processes
+    instead. Run several servers for CPU-bound search throughput.
+
+    Errors caused by the request (bad fields, unknown maps) are reported
+    with their message; any other failure is logged here and answered with
+    a generic error, so no file content or internal detail reaches clients.
+
+    Requests (the "op" field):
+        plan:  {"op": "plan", "map": "map/scenario3_maze.txt",
+                "start": [r, c], "goal": [r, c], "robot_width": 2,
+                "robot_height": 2, "method": "astar", "deadline_ms": 50,
+                "use_potential": false}
+               Only "map" is required; start and goal default to the map's.
+        batch: {"op": "batch", "requests": [plan, plan, ...]}
+               Plans run concurrently and share warm fields; a batch
+               holds at most SERVICE_MAX_BATCH requests.
+        stats: {"op": "stats"} returns aggregates over all plans served.
+        distance_matrix:
+               {"op": "distance_matrix", "map": ..., "sources": [[r, c], ...],
+                "targets": [[r, c], ...], "robot_width": 2, "robot_height": 2,
+                "paths": false} returns travel costs between every source
+               and target (null if unreachable), and the paths if asked.
+    """
+
+    def __init__(self, cache=None, workers=None, map_dir=None, max_maps=None):
+        """
+        Args:
+            cache: FieldCache to keep fields in (default: a new one using
+                   FIELD_CACHE_DIR)
+            workers: planning threads (default: SERVICE_WORKERS)
+            map_dir: directory the served maps must be in (default:
+                     SERVICE_MAP_DIR)
+            max_maps: maps kept loaded (default: SERVICE_MAX_MAPS)
+        """
+        if workers is None:
+            workers = SERVICE_WORKERS
+        if map_dir is None:
+            map_dir = SERVICE_MAP_DIR
+        if max_maps is None:
+            max_maps = SERVICE_MAX_MAPS
+
+        self.cache = cache if cache is not None else FieldCache(cache_dir=FIELD_CACHE_DIR)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.search_pool = SearchPool()
+        self.map_dir = os.path.realpath(map_dir)
+        self.max_maps = max_maps
+        self.maps = OrderedDict()
+        self.started = time.time()
+
+        # Guards the map table across worker threads (the cache has its own
+        # lock, and no file is loaded while it is held)
+        self._lock = threading.Lock()
+
+        # Aggregates are only updated on the event loop thread, which records
+        # every answered plan, so they need no lock
+        self._totals = {
+            "requests": 0,
+            "plans": 0,
+            "errors": 0,
+            "successes": 0,
+            "planning_time_ms": 0.0,
+            "nodes_explored": 0,
+            "path_cost": 0.0,
+            "methods": {},
+        }
+
+    def load_map(self, map_file):
+        """
+        Returns (grid, start, goal) for a map file, loading it on first use.
+
+        Grids are OccupancyGrids, so cache lookups reuse the digest stored on
+        the grid instead of hashing the cells, and the obstacle count is
+        computed once. Binary maps are memory-mapped. Requests for a map that
+        is being loaded wait for that load.
+
+        Args:
+            map_file: path of a map inside the map directory, relative to
+                      the working directory (e.g. "map/scenario3_maze.txt")
+        """
+        path = self._map_path(map_file)
+
+        with self._lock:
+            loading = self.maps.get(path)
+            if loading is None:
+                loading = self.maps[path] = Future()
+                owner = True
+                while len(self.maps) > self.max_maps:
+                    self.maps.popitem(last=False)
+            else:
+                self.maps.move_to_end(path)
+                owner = False
+
+        if owner:
+            try:
+                if _is_binary_map(path):
+                    loaded = load_grid_binary(path)
+                else:
+                    loaded = load_grid(path)
+            except Exception as e:
+                print(f"Could not load map {path}: {e!r}")
+                # Forget the failure so a later request can retry
+                with self._lock:
+                    if self.maps.get(path) is loading:
+                        del self.maps[path]
+                loading.set_exception(ValueError(f"Cannot load map: {map_file}"))
+            else:
+                loading.set_result(loaded)
+
+        return loading.result()
+
+    def _map_path(self, map_file):
+        """Resolves a requested map name, rejecting files outside map_dir."""
+        if not isinstance(map_file, str) or not map_file:
+            raise ValueError("'map' must be a file name.")
+
+        parts = map_file.replace("\\", "/").split("/")
+        if os.path.isabs(map_file) or ".." in parts:
+            raise ValueError(f"Map must be a relative path without '..': {map_file}")
+
+        # realpath also catches symlinks that lead out of the directory
+        path = os.path.realpath(map_file)
+        if os.path.commonpath([path, self.map_dir]) != self.map_dir or not os.path.isfile(path):
+            raise ValueError(f"Unknown map: {map_file}")
+        return path
+
+    def plan(self, request):
+        """
+        Answers one plan request (runs in a worker thread).
+
+        Returns:
+            dict with 'success', 'path' and 'statistics'
+        """
+        if "map" not in request:
+            raise ValueError("Plan request needs a 'map'.")
+
+        grid, start, goal = self.load_map(request["map"])
+        start = _cell(request.get("start", start), "start")
+        goal = _cell(request.get("goal", goal), "goal")
+        robot_width = _positive_int(request.get("robot_width", ROBOT_WIDTH), "robot_width")
+        robot_height = _positive_int(request.get("robot_height", ROBOT_HEIGHT), "robot_height")
+        deadline_ms = request.get("deadline_ms")
+        if deadline_ms is not None:
+            deadline_ms = _non_negative_number(deadline_ms, "deadline_ms")
+        method = request.get("method", "astar")
+        use_potential = request.get("use_potential", False)
+        if not isinstance(use_potential, bool):
+            raise ValueError(f"use_potential must be true or false, got {json.dumps(use_potential)}.")
+
+        rows, cols = grid.shape
+        for name, (r, c) in (("start", start), ("goal", goal)):
+            if not (0 <= r < rows and 0 <= c < cols):
+                raise ValueError(f"{name} {[r, c]} is outside the {rows} x {cols} map.")
+
+        stats = PlanningStatistics()
+        stats.set_map_info(grid, robot_width, robot_height)
+        stats.start_timer()
+
+        with stats.stage("potential"):
+            reachability = self.cache.get_reachability(
+                grid, robot_width, robot_height, statistics=stats
+            )
+            potential = self.cache.get_potential_field(
+                grid, goal, robot_width, robot_height, statistics=stats
+            )
+            abstraction = None
+            if method == "hpa":
+                abstraction = self.cache.get_abstraction(
+                    grid, robot_width, robot_height, statistics=stats
+                )
+
+        with stats.stage("search"):
+            path = extract_path(
+                potential, start, goal, statistics=stats, method=method,
+                deadline_ms=deadline_ms, reachability=reachability,
+                abstraction=abstraction, use_potential=use_potential,
+            )
+
+        stats.stop_timer()
+
+        if path and path[-1] == goal:
+            stats.set_success(True)
+            stats.set_path_info(path)
+        else:
+            stats.set_success(False, "Path did not reach goal")
+
+        return {
+            "success": stats.success,
+            "path": [[int(r), int(c)] for r, c in path],
+            "statistics": stats.get_dict(),
+        }
+
+    def matrix(self, request):
+        """
+        Answers one distance_matrix request (runs in a worker thread; large
+        jobs run their searches in the server's SearchPool).
+
+        Returns:
+            dict with 'costs' (None for unreachable pairs) and, if the
+            request sets "paths", 'paths'
+        """
+        for field in ("map", "sources", "targets"):
+            if field not in request:
+                raise ValueError(f"Distance matrix request needs '{field}'.")
+
+        sources = _cells(request["sources"], "sources")
+        targets = _cells(request["targets"], "targets")
+
+        grid, _, _ = self.load_map(request["map"])
+        robot_width = _positive_int(request.get("robot_width", ROBOT_WIDTH), "robot_width")
+        robot_height = _positive_int(request.get("robot_height", ROBOT_HEIGHT), "robot_height")
+        return_paths = bool(request.get("paths", False))
+
+        inflated_grid = self.cache.get_inflated_grid(grid, robot_width, robot_height)
+
+        result = distance_matrix(
+            grid, sources, targets,
+            robot_size=(robot_height, robot_width), return_paths=return_paths,
+            inflated_grid=inflated_grid, pool=self.search_pool,
+        )
+        costs, paths = result if return_paths else (result, None)
+
+        response = {"costs": [[None if cost == float("inf") else cost for cost in row] for row in costs]}
+        if return_paths:
+            response["paths"] = [
+                [[[int(r), int(c)] for r, c in path] for path in row] for row in paths
+            ]
+        return response
+
+    def get_stats(self):
+        """Aggregates over every plan served so far (call on the event loop)."""
+        totals = self._totals
+        plans = totals["plans"]
+        successes = totals["successes"]
+
+        return {
+            "uptime_s": time.time() - self.started,
+            "requests": totals["requests"],
+            "plans": plans,
+            "errors": totals["errors"],
+            "success_rate": successes / plans if plans else 0.0,
+            "avg_planning_time_ms": totals["planning_time_ms"] / plans if plans else 0.0,
+            "avg_nodes_explored": totals["nodes_explored"] / plans if plans else 0.0,
+            "avg_path_cost": totals["path_cost"] / successes if successes else 0.0,
+            "methods": dict(totals["methods"]),
+            "maps_loaded": len(self.maps),
+            "cache_bytes": self.cache.current_bytes,
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+        }
+
+    async def handle_request(self, request):
+        """
+        Dispatches one decoded request.
+
+        Returns:
+            response dict with 'ok' (and 'error' when ok is False)
+        """
+        loop = asyncio.get_running_loop()
+        op = request.get("op", "plan")
+
+        self._totals["requests"] += 1
+
+        try:
+            if op == "plan":
+                result = await loop.run_in_executor(self.executor, self.plan, request)
+                self._record(request, result)
+                response = {"ok": True, **result}
+            elif op == "batch":
+                requests = _batch(request.get("requests", []))
+                results = await asyncio.gather(*(
+                    self._plan_or_error(loop, item) for item in requests
+                ))
+                response = {"ok": True, "results": results}
+            elif op == "stats":
+                response = {"ok": True, "stats": self.get_stats()}
+            elif op == "distance_matrix":
+                result = await loop.run_in_executor(self.executor, self.matrix, request)
+                response = {"ok": True, **result}
+            else:
+                raise ValueError(f"Unknown op: {op}")
+        except Exception as e:
+            self._count_error()
+            response = {"ok": False, "error": _error_message(e)}
+
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    async def serve(self, socket_path=None, host="127.0.0.1", port=None):
+        """
+        Listens on a Unix socket (socket_path) or on host:port until SIGINT
+        or SIGTERM.
+        """
+        loop = asyncio.get_running_loop()
+        stop = asyncio.Event()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            server = await asyncio.start_unix_server(
+                self._handle_connection, path=socket_path, limit=MAX_LINE_BYTES
+            )
+            print(f"Planning service listening on {socket_path}")
+        else:
+            server = await asyncio.start_server(
+                self._handle_connection, host=host, port=port, limit=MAX_LINE_BYTES
+            )
+            print(f"Planning service listening on {host}:{port}")
+
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            self.executor.shutdown(wait=False)
+            self.search_pool.close()
+            if socket_path and os.path.exists(socket_path):
+                os.remove(socket_path)
+
+        print("Planning service stopped.")
+
+    async def _handle_connection(self, reader, writer):
+        pending = set()
+        write_lock = asyncio.Lock()
+
+        async def respond(request):
+            response = await self.handle_request(request)
+            async with write_lock:
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("Request must be a JSON object.")
+                except ValueError as e:
+                    self._count_error()
+                    async with write_lock:
+                        writer.write(json.dumps({"ok": False, "error": f"Bad request: {e}"}).encode() + b"\n")
+                        await writer.drain()
+                    continue
+
+                task = asyncio.ensure_future(respond(request))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _plan_or_error(self, loop, request):
+        try:
+            result = await loop.run_in_executor(self.executor, self.plan, request)
+        except Exception as e:
+            self._count_error()
+            return {"ok": False, "error": _error_message(e)}
+
+        self._record(request, result)
+        return {"ok": True, **result}
+
+    def _record(self, request, result):
+        stats = result["statistics"]
+        method = request.get("method", "astar")
+
+        totals = self._totals
+        totals["plans"] += 1
+        totals["planning_time_ms"] += stats["planning_time_ms"]
+        totals["nodes_explored"] += stats["nodes_explored"]
+        totals["methods"][method] = totals["methods"].get(method, 0) + 1
+        if stats["success"]:
+            totals["successes"] += 1
+            totals["path_cost"] += stats["path_cost"]
+
+    def _count_error(self):
+        self._totals["errors"] += 1
+
+
+def send_request(request, socket_path=None, host="127.0.0.1", port=None, timeout=None):
+    """
+    Sends one request to a running PlanningServer and waits for the answer.
+
+    A small blocking client for scripts and controllers; opens a new
+    connection per call.
+
+    Returns:
+        response dict
+    """
+    if socket_path:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        address = socket_path
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        address = (host, port)
+
+    with sock:
+        sock.settimeout(timeout)
+        sock.connect(address)
+        sock.sendall(json.dumps(request).encode() + b"\n")
+
+        with sock.makefile("rb") as f:
+            line = f.readline()
+
+    if not line:
+        raise ConnectionError("Planning service closed the connection.")
+    return json.loads(line)
+
+
+def _error_message(error):
+    """
+    Client-facing text for a failed request: the message of a ValueError
+    (raised for bad requests), a generic one for anything else.
+    """
+    if isinstance(error, ValueError):
+        return str(error)
+    print(f"Request failed: {error!r}")
+    return "Internal error while answering the request."
+
+
+def _cell(value, name):
+    """Parses a [row, col] cell of a request; anything else is a ValueError."""
+    if (
+        not isinstance(value, (list, tuple))
+        or len(value) != 2
+        or not all(isinstance(v, int) and not isinstance(v, bool) for v in value)
+    ):
+        raise ValueError(f"{name} must be [row, col] with two integers, got {json.dumps(value)}.")
+    return (value[0], value[1])
+
+
+def _positive_int(value, name):
+    """Parses a request field that must be an integer >= 1."""
+    if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+        raise ValueError(f"{name} must be a positive integer, got {json.dumps(value)}.")
+    return value
+
+
+def _non_negative_number(value, name):
+    """Parses a request field that must be a number >= 0."""
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or not value >= 0:
+        raise ValueError(f"{name} must be a non-negative number, got {json.dumps(value)}.")
+    return value
+
+
+def _batch(requests):
+    """Checks the 'requests' list of a batch: plan request objects, at most SERVICE_MAX_BATCH."""
+    if not isinstance(requests, list):
+        raise ValueError("'requests' must be a list of plan requests.")
+    if len(requests) > SERVICE_MAX_BATCH:
+        raise ValueError(f"A batch holds at most {SERVICE_MAX_BATCH} requests, got {len(requests)}.")
+    for i, item in enumerate(requests):
+        if not isinstance(item, dict):
+            raise ValueError(f"requests[{i}] must be a plan request object.")
+    return requests
+
+
+def _cells(values, name):
+    """Parses a list of [row, col] cells of a request."""
+    if not isinstance(values, list):
+        raise ValueError(f"'{name}' must be a list of [row, col] cells.")
+    return [_cell(value, f"{name}[{i}]") for i, value in enumerate(values)]
+
+
+def _is_binary_map(map_file):
+    with open(map_file, "rb") as f:
+        return f.read(len(BINARY_MAGIC)) == BINARY_MAGIC
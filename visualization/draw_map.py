@@ -1,20 +1,11 @@
-import matplotlib.pyplot as plt
-from config.settings import FREE, OBSTACLE, START, GOAL
+from visualization.renderer import render_map
 
-def draw_map(grid):
+def draw_map(grid, output_file="map_output.png"):
     """
-    Draws the occupancy grid using matplotlib.
-    """
-    color_map = {
-        FREE: 1.0,        # white
-        OBSTACLE: 0.0,    # black
-        START: 0.5,       # gray
-        GOAL: 0.7         # light gray
-    }
-
-    # Convert grid to color intensities
-    image = [[color_map[cell] for cell in row] for row in grid]
+    Draws the occupancy grid.
 
-    plt.imshow(image, cmap="gray")
-    plt.title("Occupancy Grid")
-    plt.savefig("map_output.png")
+    Args:
+        grid: 2D occupancy grid
+        output_file: where to save the image (default: "map_output.png")
+    """
+    render_map(grid, output_file)
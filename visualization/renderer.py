@@ -0,0 +1,234 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.image import imsave
+
+from config.settings import (
+    FREE,
+    OBSTACLE,
+    START,
+    GOAL,
+    RENDER_MAX_PIXELS,
+    RENDER_MIN_SIZE,
+    RENDER_WORKERS,
+)
+
+# Gray level per cell value (anything else renders as free space)
+GRAY_LEVELS = np.ones(256, dtype=np.float32)
+GRAY_LEVELS[FREE] = 1.0       # white
+GRAY_LEVELS[OBSTACLE] = 0.0   # black
+GRAY_LEVELS[START] = 0.5      # gray
+GRAY_LEVELS[GOAL] = 0.7       # light gray
+
+PATH_COLOR = (1.0, 0.0, 0.0)  # red
+HEATMAP = "viridis"
+
+
+def render_map(grid, output_file):
+    """
+    Writes the occupancy grid to a PNG file.
+
+    Args:
+        grid: 2D occupancy grid
+        output_file: PNG file to write
+    """
+    image, _ = _grid_image(grid)
+    imsave(output_file, image, cmap="gray", vmin=0.0, vmax=1.0)
+
+
+def render_path(grid, path, output_file, potential=None):
+    """
+    Writes the grid with the path overlaid to a PNG file.
+
+    Args:
+        grid: 2D occupancy grid
+        path: list of (row, col) tuples
+        output_file: PNG file to write
+        potential: potential field to use as the background heatmap instead
+                   of the gray grid (optional; inf marks obstacles)
+    """
+    gray, scale = _grid_image(grid)
+
+    if potential is None:
+        image = np.repeat(gray[:, :, None], 3, axis=2)
+    else:
+        image = _heatmap(potential, gray, scale)
+
+    mask = _path_mask(path, gray.shape, scale)
+    image[mask] = PATH_COLOR
+    imsave(output_file, image)
+
+
+class RenderQueue:
+    """
+    Renders images on background threads.
+
+    Encoding PNGs is slow compared to planning small maps, so callers submit
+    render jobs and carry on; wait() blocks until everything submitted so far
+    has been written. Jobs only read their arguments, which must not be
+    modified until the job has finished.
+    """
+
+    def __init__(self, workers=None):
+        """
+        Args:
+            workers: rendering threads (default: RENDER_WORKERS)
+        """
+        if workers is None:
+            workers = RENDER_WORKERS
+
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.pending = []
+        self._lock = threading.Lock()
+
+    def submit(self, function, *args, **kwargs):
+        """Queues function(*args, **kwargs); returns its Future."""
+        future = self.executor.submit(function, *args, **kwargs)
+        with self._lock:
+            self.pending.append(future)
+        return future
+
+    def wait(self):
+        """
+        Waits for every queued job.
+
+        Returns:
+            list of error messages of the jobs that failed
+        """
+        with self._lock:
+            pending, self.pending = self.pending, []
+
+        errors = []
+        for future in pending:
+            error = future.exception()
+            if error is not None:
+                errors.append(str(error))
+        return errors
+
+    def close(self):
+        """Waits for the queued jobs and stops the threads."""
+        errors = self.wait()
+        self.executor.shutdown()
+        return errors
+
+
+def _scale(shape):
+    """
+    Returns the image scale for a grid shape as (factor, upscale).
+
+    Small grids are enlarged so the longer side has at least RENDER_MIN_SIZE
+    pixels; large grids are reduced by whole blocks of cells until the image
+    fits in RENDER_MAX_PIXELS.
+    """
+    rows, cols = shape
+    longest = max(rows, cols, 1)
+    if longest < RENDER_MIN_SIZE:
+        return max(1, RENDER_MIN_SIZE // longest), True
+
+    factor = 1
+    while -(-rows // factor) * -(-cols // factor) > RENDER_MAX_PIXELS:
+        factor += 1
+    return factor, False
+
+
+def _resample(image, scale, fill):
+    """
+    Resizes a 2D image by the (factor, upscale) from _scale.
+
+    Reduction keeps the minimum of each block (padded with fill), so a block
+    containing a wall renders dark and thin walls survive downsampling.
+    """
+    factor, upscale = scale
+    if factor == 1:
+        return image
+    if upscale:
+        return np.repeat(np.repeat(image, factor, axis=0), factor, axis=1)
+
+    rows, cols = image.shape
+    out_rows, out_cols = -(-rows // factor), -(-cols // factor)
+    padded = np.full((out_rows * factor, out_cols * factor), fill, dtype=image.dtype)
+    padded[:rows, :cols] = image
+    return padded.reshape(out_rows, factor, out_cols, factor).min(axis=(1, 3))
+
+
+def _grid_image(grid):
+    """Returns (gray image, scale) for a grid, resampled to the pixel budget."""
+    cells = np.asarray(grid)
+    scale = _scale(cells.shape)
+    return _resample(GRAY_LEVELS[cells], scale, 1.0), scale
+
+
+def _heatmap(potential, gray, scale):
+    """
+    Colors the finite potential values with HEATMAP; obstacles (inf in the
+    field or in the grid) are black.
+    """
+    values = _resample(np.asarray(potential, dtype=np.float64), scale, np.inf)
+    finite = np.isfinite(values)
+
+    low, high = (values[finite].min(), values[finite].max()) if finite.any() else (0.0, 1.0)
+    normalized = np.zeros_like(values)
+    normalized[finite] = (values[finite] - low) / (high - low or 1.0)
+
+    image = colormaps[HEATMAP](normalized)[:, :, :3]
+    image[~finite | (gray == GRAY_LEVELS[OBSTACLE])] = 0.0
+    return image
+
+
+def _path_mask(path, shape, scale):
+    """
+    Rasterizes the path as connected line segments on an image of the
+    given shape.
+
+    Every segment is sampled once per pixel along its longer axis, for all
+    segments at once. Enlarged images get a proportionally thicker line.
+    """
+    mask = np.zeros(shape, dtype=bool)
+    if not path:
+        return mask
+
+    factor, upscale = scale
+    points = np.asarray(path, dtype=np.int64).reshape(-1, 2)
+    if upscale:
+        points = points * factor + factor // 2
+    else:
+        points = points // factor
+
+    if len(points) == 1:
+        mask[points[0, 0], points[0, 1]] = True
+        return mask
+
+    starts, ends = points[:-1], points[1:]
+    steps = np.abs(ends - starts).max(axis=1)
+    counts = steps + 1
+
+    # Sample k = 0..steps on every segment, flattened
+    segment = np.repeat(np.arange(len(starts)), counts)
+    offsets = np.cumsum(counts) - counts
+    k = np.arange(counts.sum()) - offsets[segment]
+    t = k / np.maximum(steps, 1)[segment]
+
+    pixels = starts[segment] + np.rint((ends - starts)[segment] * t[:, None]).astype(np.int64)
+    mask[pixels[:, 0], pixels[:, 1]] = True
+
+    # Thicken the line on enlarged images (about a quarter of a cell)
+    radius = factor // 8 if upscale else 0
+    if radius:
+        thick = mask.copy()
+        for dr in range(-radius, radius + 1):
+            for dc in range(-radius, radius + 1):
+                thick |= _shift(mask, dr, dc)
+        mask = thick
+
+    return mask
+
+
+def _shift(mask, dr, dc):
+    """Returns mask moved by (dr, dc), filling with False."""
+    rows, cols = mask.shape
+    shifted = np.zeros_like(mask)
+    shifted[max(dr, 0):rows + min(dr, 0), max(dc, 0):cols + min(dc, 0)] = \
+        mask[max(-dr, 0):rows + min(-dr, 0), max(-dc, 0):cols + min(-dc, 0)]
+    return shifted